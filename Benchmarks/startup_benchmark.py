@@ -0,0 +1,144 @@
+# Startup benchmark for the IFC2Bauzustand GUI
+#
+# Measures the import-time breakdown of the script (python -X importtime) and the
+# time until the main window is first painted. Exits with code 1 if a budget is
+# exceeded, if IfcOpenShell is loaded during startup or if no display (DISPLAY,
+# pyvirtualdisplay or Xvfb) is available for the paint measurement; --no-paint
+# skips that measurement explicitly.
+#
+# Usage: python Benchmarks/startup_benchmark.py [--import-budget 0.5] [--paint-budget 2.0] [--runs 3] [--no-paint]
+import argparse
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = glob.glob(os.path.join(ROOT, "UC_*_IFC2Bauzustand_*.py"))[0]
+HEAVY_MODULES = ("ifcopenshell",)
+PAINTED_MARKER = "PAINTED"
+
+# Loads the script as a module without running the entry point
+IMPORT_SNIPPET = (
+    "import importlib.util, sys\n"
+    "spec = importlib.util.spec_from_file_location('ifc2bauzustand', sys.argv[1])\n"
+    "module = importlib.util.module_from_spec(spec)\n"
+    "spec.loader.exec_module(module)\n"
+)
+
+# Builds the main window and reports once it is mapped on screen
+PAINT_SNIPPET = IMPORT_SNIPPET + (
+    "app = module.BIMcollabGUI(False)\n"
+    "app.update()\n"
+    "while not app.winfo_viewable():\n"
+    "    app.update()\n"
+    "print('" + PAINTED_MARKER + "', flush=True)\n"
+    "print('HEAVY', ' '.join(m for m in sys.argv[2:] if m in sys.modules), flush=True)\n"
+    "app.destroy()\n"
+)
+
+
+def import_breakdown():
+    """Run the import once with -X importtime and return (total seconds, rows)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET, SCRIPT],
+        capture_output=True, text=True, check=True)
+
+    # Rows look like "import time:  self [us] | cumulative | package"
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), int(self_us), name[1:].rstrip()))
+    top_level = sum(cumulative for cumulative, _, name in rows if not name.startswith(" "))
+    return top_level / 1e6, rows
+
+
+def time_to_first_paint():
+    """Start the GUI in a subprocess and return (seconds until painted, heavy modules loaded)"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", PAINT_SNIPPET, SCRIPT, *HEAVY_MODULES],
+        capture_output=True, text=True, timeout=60)
+    elapsed = time.perf_counter() - start
+    if PAINTED_MARKER not in result.stdout:
+        raise RuntimeError(result.stderr.strip() or "Fenster wurde nicht angezeigt")
+    heavy = result.stdout.split("HEAVY", 1)[1].split()
+    return elapsed, heavy
+
+
+def start_virtual_display():
+    """Provide an X display for the paint measurement; returns a stop callback or None"""
+    if sys.platform.startswith("win") or sys.platform == "darwin" or os.environ.get("DISPLAY"):
+        return lambda: None
+    try:
+        from pyvirtualdisplay import Display
+
+        display = Display(visible=False, size=(1280, 1024))
+        display.start()
+        return display.stop
+    except ImportError:
+        pass
+    if shutil.which("Xvfb"):
+        process = subprocess.Popen(["Xvfb", ":99", "-screen", "0", "1280x1024x24"],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.environ["DISPLAY"] = ":99"
+        time.sleep(0.5)
+        return process.terminate
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startzeit-Benchmark für IFC2Bauzustand")
+    parser.add_argument("--import-budget", type=float, default=0.5, help="Maximale Importzeit in Sekunden")
+    parser.add_argument("--paint-budget", type=float, default=2.0, help="Maximale Zeit bis zum ersten Zeichnen in Sekunden")
+    parser.add_argument("--runs", type=int, default=3, help="Anzahl Messläufe (Bestwert zählt)")
+    parser.add_argument("--top", type=int, default=10, help="Anzahl angezeigter Module")
+    parser.add_argument("--no-paint", action="store_true", help="Zeit bis zum ersten Zeichnen nicht messen")
+    args = parser.parse_args()
+    failed = False
+
+    # Import-time breakdown, best of several runs to reduce noise
+    measurements = [import_breakdown() for _ in range(args.runs)]
+    import_time, rows = min(measurements, key=lambda m: m[0])
+    print(f"Importzeit: {import_time:.3f} s (Budget {args.import_budget:.3f} s)")
+    for cumulative, self_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {cumulative / 1e3:8.1f} ms  (eigen {self_us / 1e3:6.1f} ms)  {name.strip()}")
+    loaded = sorted({name.strip() for _, _, name in rows} & set(HEAVY_MODULES))
+    if loaded:
+        print(f"FEHLER: beim Start geladen: {', '.join(loaded)}")
+        failed = True
+    if import_time > args.import_budget:
+        print("FEHLER: Importbudget überschritten")
+        failed = True
+
+    # Time to first paint, only possible with a display
+    if args.no_paint:
+        print("Zeichenzeit übersprungen (--no-paint)")
+        return 1 if failed else 0
+    stop_display = start_virtual_display()
+    if stop_display is None:
+        print("FEHLER: Zeichenzeit nicht messbar, kein Display (DISPLAY, pyvirtualdisplay oder Xvfb) verfügbar; "
+              "mit --no-paint explizit überspringen")
+        failed = True
+    else:
+        try:
+            paint_time, heavy = min(time_to_first_paint() for _ in range(args.runs))
+        finally:
+            stop_display()
+        print(f"Zeit bis zum ersten Zeichnen: {paint_time:.3f} s (Budget {args.paint_budget:.3f} s)")
+        if heavy:
+            print(f"FEHLER: vor dem ersten Zeichnen geladen: {', '.join(heavy)}")
+            failed = True
+        if paint_time > args.paint_budget:
+            print("FEHLER: Zeichenbudget überschritten")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# Shared fixtures for the IFC2Bauzustand tests
+#
+# Usage: python -m pytest Tests
+import glob
+import importlib.util
+import os
+import sys
+import types
+
+import ifcopenshell
+import ifcopenshell.api
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = glob.glob(os.path.join(ROOT, "UC_*_IFC2Bauzustand_*.py"))[0]
+EXAMPLE_MODEL = glob.glob(os.path.join(ROOT, "Examples", "IFC_*.ifc"))[0]
+
+
+@pytest.fixture(scope="session")
+def bz():
+    """The script loaded as a module, without running the entry point"""
+    spec = importlib.util.spec_from_file_location("ifc2bauzustand", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["ifc2bauzustand"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class Value:
+    """Stand-in for a Tk variable"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class Headless:
+    """Calls BIMcollabGUI methods without creating a window; log messages are collected"""
+
+    def __init__(self, module, **state):
+        self._gui = module.BIMcollabGUI
+        self.logs = []
+        self.__dict__.update(state)
+
+    def log(self, message):
+        self.logs.append(message)
+
+    def __getattr__(self, name):
+        return types.MethodType(getattr(self._gui, name), self)
+
+
+@pytest.fixture
+def headless(bz):
+    """Factory for GUI stand-ins with the given instance attributes"""
+    return lambda **state: Headless(bz, **state)
+
+
+@pytest.fixture
+def make_model(tmp_path):
+    """Factory for small IFC4 test models, written to tmp_path.
+
+    walls maps wall names to the properties of their property set (None: no property set),
+    storeys optionally maps storey names to the walls they contain. Returns (model, path).
+    """
+    def make(walls, storeys=None, name="model.ifc", pset_name="CH_Ing_Uebergeordnet"):
+        ifc = ifcopenshell.api.run("project.create_file", version="IFC4")
+        project = ifcopenshell.api.run("root.create_entity", ifc, ifc_class="IfcProject", name="P")
+        ifcopenshell.api.run("unit.assign_unit", ifc)
+        site = ifcopenshell.api.run("root.create_entity", ifc, ifc_class="IfcSite", name="Site")
+        ifcopenshell.api.run("aggregate.assign_object", ifc, products=[site], relating_object=project)
+        containers = {}
+        for storey_name, members in (storeys or {}).items():
+            storey = ifcopenshell.api.run("root.create_entity", ifc, ifc_class="IfcBuildingStorey", name=storey_name)
+            ifcopenshell.api.run("aggregate.assign_object", ifc, products=[storey], relating_object=site)
+            containers.update(dict.fromkeys(members, storey))
+        for wall_name, properties in walls.items():
+            wall = ifcopenshell.api.run("root.create_entity", ifc, ifc_class="IfcWall", name=wall_name)
+            if wall_name in containers:
+                ifcopenshell.api.run("spatial.assign_container", ifc, products=[wall],
+                                     relating_structure=containers[wall_name])
+            if properties is not None:
+                pset = ifcopenshell.api.run("pset.add_pset", ifc, product=wall, name=pset_name)
+                ifcopenshell.api.run("pset.edit_pset", ifc, pset=pset, properties=properties)
+        path = tmp_path / name
+        ifc.write(str(path))
+        return ifc, path
+
+    return make
@@ -0,0 +1,52 @@
+# Tests of the deterministic output helpers
+import os
+import time
+
+import pytest
+
+from conftest import Value
+
+
+@pytest.mark.skipif(not hasattr(time, "tzset"), reason="Zeitzone lässt sich nur auf POSIX umstellen")
+def test_timestamp_is_utc_in_every_local_timezone(bz, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    stamps = set()
+    try:
+        for zone in ("UTC", "Europe/Zurich", "America/New_York"):
+            monkeypatch.setenv("TZ", zone)
+            time.tzset()
+            stamps.add(bz.deterministic_timestamp([]))
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    assert stamps == {"2023-11-14T22:13:20"}
+
+
+def test_unchanged_output_is_skipped_until_it_is_rewritten(bz, headless, tmp_path, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    props = ([("CH_Ing_Uebergeordnet", "Bauphase")], [("CH_Ing_Uebergeordnet", "Rueckbauphase")])
+    output = str(tmp_path / "smartview.bcsv")
+    deterministic = Value(True)
+    gui = headless(selected_files=["model.ifc"], ifc_projects={}, deterministic_output=deterministic)
+
+    def write():
+        return gui.write_smartview_output([0, 1.0, 2.0], *props, output, formats=["bcsv"])
+
+    assert write()
+    assert not write()
+
+    # A non-deterministic run in between invalidates the sidecar of the previous deterministic run
+    deterministic.set(False)
+    assert write()
+    assert not os.path.exists(output + bz.FINGERPRINT_SUFFIX)
+    deterministic.set(True)
+    assert write()
+    assert not write()
+
+    # Outputs edited after the sidecar was written, and changed writer parameters, are rewritten
+    with open(output, "a", encoding="utf-8") as f:
+        f.write("\n")
+    assert write()
+    monkeypatch.setitem(bz.ZOOM_CONDITIONS, "eq", "Equal")
+    assert write()
+    assert not write()
@@ -0,0 +1,34 @@
+# Tests of reading compressed models (.ifczip)
+import tempfile
+import zipfile
+
+import pytest
+
+
+@pytest.fixture
+def ifczip_path(make_model, tmp_path):
+    """Small IFC4 model packed as ifcZIP (with a non-IFC member first)"""
+    _, path = make_model({"W1": {"Bauphase": 1.0}, "W2": None})
+    archive = tmp_path / "model.ifczip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("readme.txt", "kein Modell")
+        zf.write(path, "modell/model.ifc")
+    return str(archive)
+
+
+def test_header_sniff_reads_the_compressed_schema(bz, ifczip_path):
+    assert bz.sniff_ifc_schema(ifczip_path) == "IFC4"
+
+
+@pytest.mark.parametrize("limit, source", [(1 << 30, "Disk: 0 MB"), (0, "temporäre Datei")])
+def test_ifczip_is_parsed_from_memory_or_a_temporary_file(bz, headless, ifczip_path, tmp_path, monkeypatch,
+                                                         limit, source):
+    temp_dir = tmp_path / "temp"
+    temp_dir.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(temp_dir))
+    monkeypatch.setattr(bz, "IFCZIP_MEMORY_LIMIT", limit)
+    gui = headless()
+    ifc = gui.open_ifc_file_safely(ifczip_path)
+    assert sorted(wall.Name for wall in ifc.by_type("IfcWall")) == ["W1", "W2"]
+    assert source in gui.logs[-1]
+    assert not list(temp_dir.iterdir())
@@ -0,0 +1,79 @@
+# Consistency of the parallel IFC-SPF scan with the object-based traversal
+#
+# The chunked scan must find the same values as collect_phase_values on the example model
+# and on a stress copy of it: strings containing ';', quotes, backslashes and comment
+# markers, and a property set whose name needs \X2\ escapes. Chunk sizes go down to
+# chunks smaller than one record.
+import ifcopenshell
+import ifcopenshell.guid
+import pytest
+
+from conftest import EXAMPLE_MODEL, Value
+
+STRESS_PSET = "Bauphasen_Über;'Test'"
+PAIRS = [
+    ("CH_Ing_Uebergeordnet", "Bauphase"),
+    ("CH_Ing_Uebergeordnet", "Rueckbauphase"),
+    (STRESS_PSET, "Bauphase"),
+    (STRESS_PSET, "Rueckbauphase"),
+]
+
+
+@pytest.fixture(scope="module")
+def stress_model(tmp_path_factory):
+    """Copy of the example model with hostile strings and a second, escaped property set name"""
+    ifc = ifcopenshell.open(EXAMPLE_MODEL)
+    for i, element in enumerate(ifc.by_type("IfcElement")):
+        element.Name = f"Wand;{i} 'Süd' \\ #99=IFCWALL('x',$);"
+        element.Description = "Ende';\n/* kein Kommentar */ ''"
+    for rel in ifc.by_type("IfcRelDefinesByProperties"):
+        pset = rel.RelatingPropertyDefinition
+        if pset.is_a("IfcPropertySet") and pset.Name == "CH_Ing_Uebergeordnet":
+            copy = ifc.create_entity(
+                "IfcPropertySet", GlobalId=ifcopenshell.guid.new(), OwnerHistory=pset.OwnerHistory,
+                Name=STRESS_PSET, HasProperties=pset.HasProperties)
+            ifc.create_entity(
+                "IfcRelDefinesByProperties", GlobalId=ifcopenshell.guid.new(), OwnerHistory=rel.OwnerHistory,
+                RelatedObjects=rel.RelatedObjects, RelatingPropertyDefinition=copy)
+    path = tmp_path_factory.mktemp("scan") / "stress.ifc"
+    ifc.write(str(path))
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 65536, 4096, 997])
+@pytest.mark.parametrize("model", ["example", "stress"])
+def test_parallel_scan_matches_the_traversal(bz, headless, stress_model, monkeypatch, model, chunk_size):
+    path = EXAMPLE_MODEL if model == "example" else stress_model
+    serial = headless(selected_files=[path], ifc_schemas={}, parallel_scan=Value(False)).collect_phase_values(PAIRS)
+    expected = {pair: list(collector) for pair, collector in serial.items()}
+    assert expected[PAIRS[0]]
+    if model == "stress":
+        assert expected[PAIRS[2]] == expected[PAIRS[0]]
+
+    if chunk_size:
+        monkeypatch.setattr(bz, "SCAN_CHUNK_SIZE", chunk_size)
+    type_names = ()
+    if (bz.sniff_ifc_schema(path) or "").startswith("IFC2X3"):
+        type_names = bz.ifc_subtype_names("IFC2X3", "IfcTypeObject")
+    values, records, chunks = bz.scan_phase_values(path, PAIRS, workers=2, type_names=type_names)
+    assert {pair: list(collector) for pair, collector in values.items()} == expected
+    assert records > 0
+    if chunk_size:
+        assert chunks > 2
+
+
+def test_only_unavailable_workers_fall_back_to_the_traversal(bz, headless, monkeypatch):
+    def broken(*args, **kwargs):
+        raise OSError("keine Prozesse")
+
+    monkeypatch.setattr(bz, "scan_phase_values", broken)
+    gui = headless(selected_files=[EXAMPLE_MODEL], ifc_schemas={}, parallel_scan=Value(True))
+    assert list(gui.collect_phase_values(PAIRS[:1])[PAIRS[0]])
+    assert any("OSError: keine Prozesse" in message for message in gui.logs)
+
+    def faulty(*args, **kwargs):
+        raise ValueError("Scanfehler")
+
+    monkeypatch.setattr(bz, "scan_phase_values", faulty)
+    with pytest.raises(ValueError):
+        gui.collect_phase_values(PAIRS[:1])
@@ -0,0 +1,36 @@
+# Tests of the compact phase containers (PhaseCollector, ElementPhases)
+import math
+
+import pytest
+
+
+@pytest.mark.parametrize("phase", [0.0, 1.0, 2.5, 1e6])
+def test_collector_merges_values_within_the_tolerance(bz, phase):
+    tolerance = bz.PHASE_TOLERANCE * max(1.0, phase)
+    collector = bz.PhaseCollector([phase])
+    assert not collector.add(phase + tolerance / 2)
+    assert not collector.add(phase - tolerance / 2)
+    assert collector.add(phase + tolerance * 10)
+    assert collector.add(phase - tolerance * 10)
+    assert list(collector) == [phase - tolerance * 10, phase, phase + tolerance * 10]
+
+
+def test_collector_keeps_values_sorted_and_ignores_nan(bz):
+    collector = bz.PhaseCollector([3.0, 1.0, 2.0, 1.0 + 1e-12, float("nan"), 2.0])
+    collector.update(bz.PhaseCollector([0.0, 3.0]))
+    assert list(collector) == [0.0, 1.0, 2.0, 3.0]
+    assert bz.finalize_phases(collector) == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_element_phases_pack_missing_phases_as_nan(bz):
+    phases = bz.ElementPhases()
+    phases.add(11, 1.0, None)
+    phases.add(12, None, 2.0)
+    phases.add(13, 0.0, 3.0)
+
+    assert len(phases) == 3
+    assert list(phases) == list(phases.keys()) == [11, 12, 13]
+    assert dict(phases.items()) == {11: (1.0, None), 12: (None, 2.0), 13: (0.0, 3.0)}
+    assert phases.ids.typecode == "q" and phases.bau.typecode == phases.rueck.typecode == "d"
+    assert math.isnan(phases.rueck[0]) and math.isnan(phases.bau[1])
+    assert list(phases.phase_values()) == [0.0, 1.0, 2.0, 3.0]
@@ -0,0 +1,44 @@
+# Tests of the preview statistics (add_properties_from_ifc, update_preview)
+import re
+
+import ifcopenshell
+import pytest
+
+from conftest import EXAMPLE_MODEL, Value
+
+
+class Text:
+    """Stand-in for the preview text box"""
+
+    def __init__(self):
+        self.content = ""
+
+    def configure(self, **kwargs):
+        pass
+
+    def delete(self, *args):
+        self.content = ""
+
+    def insert(self, index, text):
+        self.content += text
+
+
+@pytest.fixture
+def preview(headless):
+    """Preview text of the example model with the standard attribution"""
+    gui = headless(pset_properties={}, preview_text=Text(), use_standard_attribution=Value(True),
+                   update_property_checkboxes=lambda: None)
+    gui.add_properties_from_ifc(ifcopenshell.open(EXAMPLE_MODEL), EXAMPLE_MODEL)
+    gui.update_preview()
+    return gui.preview_text.content.splitlines()
+
+
+def test_preview_counts_the_example_model(preview):
+    assert preview[0] == "Bauphase CH_Ing_Uebergeordnet.Bauphase: 159 Elemente, 100% numerisch"
+    assert preview[1] == "Rückbauphase CH_Ing_Uebergeordnet.Rueckbauphase: 159 Elemente, 100% numerisch"
+    assert preview[2] == "23 Phasen:"
+    assert len([line for line in preview if line.startswith("  Phase ")]) == 23
+
+    # Every element carries one Bauphase, so the per-phase counts add up to all elements
+    counts = [re.search(r": (\d+) erstellt, (\d+) rückgebaut$", line) for line in preview[3:26]]
+    assert sum(int(match.group(1)) for match in counts) == 159
@@ -0,0 +1,39 @@
+# Tests of the generation profiles (load_profiles)
+import glob
+import json
+import os
+
+import pytest
+
+from conftest import EXAMPLE_MODEL, ROOT, Value
+
+EXAMPLE_PROFILES = glob.glob(os.path.join(ROOT, "Examples", "PROFILE_*.json"))[0]
+
+
+def test_example_profiles_use_properties_of_the_example_model(bz, headless):
+    profiles = bz.load_profiles(EXAMPLE_PROFILES)
+    assert len(profiles) == 2
+    gui = headless(selected_files=[EXAMPLE_MODEL], ifc_schemas={}, parallel_scan=Value(False))
+    for profile in profiles:
+        pairs = [(pset, prop) for pset in profile["psets"]
+                 for prop in profile["bauphase"] + profile["rueckbauphase"]]
+        values = gui.collect_phase_values(pairs)
+        assert all(values[pair] for pair in pairs), profile["name"]
+
+
+@pytest.mark.parametrize("entry, message", [
+    ({"psets": "CH_Ing_Uebergeordnet"}, "Profil Etappen: psets muss eine Liste von Namen sein"),
+    ({"formats": "json"}, "Profil Etappen: formats muss eine Liste von Namen sein"),
+    ({"bauphase": ["Bauphase", 2]}, "Profil Etappen: bauphase muss eine Liste von Namen sein"),
+    ({"formats": ["bcsv", "pdf"]}, "Profil Etappen: unbekannte Formate pdf"),
+    ({"output": None}, "Profil Etappen: fehlende Angaben output"),
+    ({"title": 3}, "Profil 1: title muss ein Text sein"),
+])
+def test_invalid_profiles_name_the_profile(bz, tmp_path, entry, message):
+    profile = {"name": "Etappen", "psets": ["CH_Ing_Uebergeordnet"], "bauphase": ["Bauphase"],
+               "rueckbauphase": ["Rueckbauphase"], "output": "etappen.bcsv"}
+    profile.update(entry)
+    path = tmp_path / "profile.json"
+    path.write_text(json.dumps({"profiles": [profile]}), encoding="utf-8")
+    with pytest.raises(ValueError, match=message):
+        bz.load_profiles(str(path))
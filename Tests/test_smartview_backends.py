@@ -0,0 +1,75 @@
+# Golden-file tests of the smartview backends (deterministic mode on the example model)
+#
+# Regenerate the golden files after an intended output change with:
+#   UPDATE_GOLDEN=1 python -m pytest Tests/test_smartview_backends.py
+import glob
+import os
+import re
+
+import pytest
+
+from conftest import EXAMPLE_MODEL, ROOT, Value
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+EXAMPLE_BCSV = glob.glob(os.path.join(ROOT, "Examples", "BCSV_*.bcsv"))[0]
+BAUPHASE = [("CH_Ing_Uebergeordnet", "Bauphase")]
+RUECKBAUPHASE = [("CH_Ing_Uebergeordnet", "Rueckbauphase")]
+
+
+@pytest.fixture
+def outputs(bz, headless, tmp_path, monkeypatch):
+    """Write all formats, without and with zones, and return {file name: content}"""
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    monkeypatch.setattr(bz.getpass, "getuser", lambda: "info@bs-ing.ch")
+    gui = headless(selected_files=[EXAMPLE_MODEL], ifc_schemas={}, ifc_projects={},
+                   deterministic_output=Value(True), parallel_scan=Value(False))
+    values = gui.collect_phase_values(BAUPHASE + RUECKBAUPHASE)
+    collector = bz.PhaseCollector()
+    for found in values.values():
+        collector.update(found)
+    phases = bz.finalize_phases(collector)
+
+    formats = list(bz.SMARTVIEW_FORMATS)
+    gui.write_smartview_output(phases, BAUPHASE, RUECKBAUPHASE, str(tmp_path / "smartview.bcsv"), formats=formats)
+    zones = [("OG1", phases[:4]), ("EG & <Süd>", phases[2:6])]
+    gui.write_smartview_output(phases, BAUPHASE, RUECKBAUPHASE, str(tmp_path / "smartview_zones.bcsv"),
+                               zones=zones, zone_property=bz.ZONE_MODES["Geschoss"][1], formats=formats)
+
+    result = {}
+    for path in sorted(tmp_path.iterdir()):
+        if path.suffix in {extension for _, extension, _ in bz.SMARTVIEW_FORMATS.values()}:
+            result[path.name] = path.read_text(encoding="utf-8")
+    return result
+
+
+@pytest.mark.parametrize("name", [
+    f"smartview{variant}{extension}"
+    for variant in ("", "_zones")
+    for extension in (".bcsv", ".xml", ".json")
+])
+def test_backend_matches_golden_file(outputs, name):
+    golden_path = os.path.join(GOLDEN_DIR, name)
+    if os.environ.get("UPDATE_GOLDEN"):
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+        with open(golden_path, "w", encoding="utf-8", newline="") as f:
+            f.write(outputs[name])
+    with open(golden_path, encoding="utf-8", newline="") as f:
+        assert outputs[name] == f.read()
+
+
+def test_bcsv_follows_the_example_output(outputs):
+    """Same vocabulary and smartviews as Examples/BCSV_..., "And..." conditions carry no colour"""
+    with open(EXAMPLE_BCSV, encoding="utf-8") as f:
+        example = f.read()
+    generated = outputs["smartview.bcsv"]
+
+    def tags(text):
+        return set(re.findall(r"<([A-Za-z]+)>", text))
+
+    def titles(text):
+        return [title.strip() for title in re.findall(r"<SMARTVIEW>\s*<TITLE>([^<]*)</TITLE>", text)]
+
+    assert tags(generated) == tags(example)
+    assert titles(generated) == titles(example)
+    assert "<TYPE>And...</TYPE><R>" not in example
+    assert "<TYPE>And...</TYPE><R>" not in generated
@@ -0,0 +1,99 @@
+# Tests of the schedule-derived phases (IfcTask)
+import json
+
+import ifcopenshell
+import ifcopenshell.api
+import ifcopenshell.guid
+import ifcopenshell.util.element
+import pytest
+
+from conftest import Value
+
+# Task name -> (start, predefined type, assigned walls)
+TASKS = {
+    "Aushub": ("2025-01-06T08:00:00", "CONSTRUCTION", ["C1"]),
+    "Rueckbau": ("2025-02-03T08:00:00", "DEMOLITION", ["C1"]),
+    "Stuetzmauer": ("2025-03-03T08:00:00", "CONSTRUCTION", ["B1"]),
+}
+# Walls with phase properties of their own: B1 is scheduled as well, A_phased is not
+PROPERTY_PHASES = {"A_phased": 2.0, "B1": 1.0}
+
+
+@pytest.fixture
+def model_path(make_model):
+    """IFC4 model with a small construction schedule and existing phase properties"""
+    ifc, path = make_model({
+        name: {"Bauphase": PROPERTY_PHASES[name], "Rueckbauphase": 0.0} if name in PROPERTY_PHASES else None
+        for name in ("A_phased", "B1", "C1")
+    }, name="schedule.ifc")
+    add_tasks(ifc, TASKS)
+    ifc.write(str(path))
+    return path
+
+
+def add_tasks(ifc, tasks):
+    """Add IfcTasks {name: (start, predefined type, assigned wall names)} to a model"""
+    walls = {wall.Name: wall for wall in ifc.by_type("IfcWall")}
+    for name, (start, kind, assigned) in tasks.items():
+        task = ifcopenshell.api.run("root.create_entity", ifc, ifc_class="IfcTask", name=name)
+        task.PredefinedType = kind
+        task.TaskTime = ifc.create_entity("IfcTaskTime", ScheduleStart=start)
+        ifc.create_entity("IfcRelAssignsToProcess", ifcopenshell.guid.new(),
+                          RelatedObjects=[walls[w] for w in assigned], RelatingProcess=task)
+
+
+def test_schedule_phases_get_a_property_set_of_their_own(bz, headless, model_path, tmp_path):
+    gui = headless()
+    ifc = ifcopenshell.open(str(model_path))
+    element_phases = gui.build_task_phase_index(ifc)
+    output = tmp_path / "schedule_Bauphasen.ifc"
+    gui.write_task_phase_model(str(model_path), ifc, element_phases, str(output))
+
+    pset_name, bau_name, rueck_name = bz.TASK_PHASE_PSET
+    assert pset_name != "CH_Ing_Uebergeordnet"
+    result = ifcopenshell.open(str(output))
+    walls = {w.Name: ifcopenshell.util.element.get_psets(w) for w in result.by_type("IfcWall")}
+    assert walls["B1"][pset_name][bau_name] == 3.0
+    assert walls["C1"][pset_name][bau_name] == 1.0
+    assert walls["C1"][pset_name][rueck_name] == 2.0
+    assert pset_name not in walls["A_phased"]
+
+    # Existing phase properties are left untouched and not mixed into the schedule phases
+    assert walls["B1"]["CH_Ing_Uebergeordnet"]["Bauphase"] == 1.0
+    assert walls["A_phased"]["CH_Ing_Uebergeordnet"]["Bauphase"] == 2.0
+    reader = headless(selected_files=[str(output)], ifc_schemas={}, parallel_scan=Value(False))
+    values = reader.collect_phase_values([(pset_name, bau_name), (pset_name, rueck_name)])
+    assert sorted(values[(pset_name, bau_name)]) == [1.0, 3.0]
+
+
+def test_schedule_dates_are_ranked_across_models(bz, headless, make_model, tmp_path, monkeypatch):
+    """A task of the second model between two tasks of the first one gets the middle phase"""
+    first, first_path = make_model({"A1": None, "A2": None}, name="first.ifc")
+    add_tasks(first, {
+        "Fundament": ("2025-01-06T08:00:00", "CONSTRUCTION", ["A1"]),
+        "Rueckbau": ("2025-03-03T08:00:00", "DEMOLITION", ["A2"]),
+    })
+    first.write(str(first_path))
+    second, second_path = make_model({"B1": None}, name="second.ifc")
+    add_tasks(second, {"Bruecke": ("2025-02-03T08:00:00", "CONSTRUCTION", ["B1"])})
+    second.write(str(second_path))
+
+    monkeypatch.setattr(bz.messagebox, "showinfo", lambda *args: None)
+    output = tmp_path / "out" / "schedule.json"
+    output.parent.mkdir()
+    gui = headless(selected_files=[str(first_path), str(second_path)], ifc_schemas={}, ifc_projects={},
+                   output_path=Value(str(output)), deterministic_output=Value(False),
+                   output_formats={"json": Value(True)})
+    gui.process_task_schedule()
+
+    pset_name, bau_name, rueck_name = bz.TASK_PHASE_PSET
+    phases = {}
+    for stem in ("first", "second"):
+        result = ifcopenshell.open(str(output.parent / f"{stem}_Bauphasen.ifc"))
+        for wall in result.by_type("IfcWall"):
+            pset = ifcopenshell.util.element.get_psets(wall)[pset_name]
+            phases[wall.Name] = (pset[bau_name], pset[rueck_name])
+    assert phases == {"A1": (1.0, 0.0), "A2": (0.0, 3.0), "B1": (2.0, 0.0)}
+
+    sets = json.loads(output.read_text(encoding="utf-8"))["sets"]
+    assert [view["phase"] for view in sets[0]["views"]] == [0.0, 1.0, 2.0, 3.0, 4.0]
@@ -0,0 +1,73 @@
+# Tests of the zone-partitioned smartviews
+import io
+import json
+import re
+
+import pytest
+
+from conftest import Value
+
+# Wall name -> value of the grouping property CH_Ing_Uebergeordnet.Abschnitt (None: property missing)
+SECTIONS = {"W1": 1, "W2": 2, "W3": 2, "W4": None}
+
+
+@pytest.fixture
+def model(make_model):
+    """IFC4 model whose walls carry an integer grouping property"""
+    walls = {
+        name: {"Bauphase": 1.0} if section is None else {"Bauphase": 1.0, "Abschnitt": section}
+        for name, section in SECTIONS.items()
+    }
+    return make_model(walls)[0]
+
+
+def test_property_zones_keep_the_value_type(model, headless):
+    gui = headless()
+    index = gui.build_zone_index(model, "Eigenschaft", ("CH_Ing_Uebergeordnet", "Abschnitt"))
+    names = {model.by_id(eid).Name: zone for eid, zone in index.items()}
+    assert names == {"W1": 1, "W2": 2, "W3": 2}
+    assert all(type(zone) is int for zone in names.values())
+
+
+def test_zone_rules_use_the_property_type(bz, headless):
+    gui = headless(selected_files=[])
+    zone_property = ("Abschnitt", "CH_Ing_Uebergeordnet", "PropertySet", None)
+    pairs = ([("CH_Ing_Uebergeordnet", "Bauphase")], [("CH_Ing_Uebergeordnet", "Rueckbauphase")])
+    ruleset = gui.compile_smartviews([0.0, 1.0, 2.0], *pairs, zones=[(2, [0.0, 1.0, 2.0])],
+                                     zone_property=zone_property)
+    zone_rules = ruleset["sets"][0]["views"][1]["rules"][-2:]
+    assert [(r.conditions[0].operator, r.conditions[0].value, r.conditions[0].value_type) for r in zone_rules] == [
+        ("ne", 2, "IntegerValue"), ("undefined", None, "IntegerValue")]
+
+    output = io.StringIO()
+    bz.write_bcsv(ruleset, output)
+    text = output.getvalue()
+    assert ("<NAME>Abschnitt</NAME><PROPERTYSETNAME>CH_Ing_Uebergeordnet</PROPERTYSETNAME><TYPE>PropertySet</TYPE>"
+            "<VALUETYPE>IntegerValue</VALUETYPE><UNIT>None</UNIT></PROPERTY><CONDITION><TYPE>NotEquals</TYPE>"
+            "<VALUE>2</VALUE>") in text
+    assert "<CONDITION><TYPE>Undefined</TYPE><VALUE></VALUE></CONDITION><ACTION><TYPE>Remove</TYPE>" in text
+
+
+def test_zero_zones_stay_apart_and_keep_their_notation(bz, headless, make_model, tmp_path, monkeypatch):
+    """0, False and 0.0 are distinct zones; only DoubleValue conditions get ZOOM's zero literal"""
+    ifc, path = make_model({
+        "W_int": {"Bauphase": 1.0, "Abschnitt": 0},
+        "W_bool": {"Bauphase": 1.0, "Abschnitt": False},
+        "W_real": {"Bauphase": 2.0, "Abschnitt": 0.0},
+    })
+    monkeypatch.setattr(bz.messagebox, "showinfo", lambda *args: None)
+    output = tmp_path / "zones.bcsv"
+    gui = headless(selected_files=[str(path)], ifc_schemas={}, ifc_projects={}, output_path=Value(str(output)),
+                   zone_grouping=Value("CH_Ing_Uebergeordnet.Abschnitt"), deterministic_output=Value(False),
+                   output_formats={"bcsv": Value(True), "json": Value(True)})
+    gui.process_zones(["CH_Ing_Uebergeordnet"], ["Bauphase"], ["Rueckbauphase"], "Eigenschaft")
+
+    sets = json.loads(output.with_suffix(".json").read_text(encoding="utf-8"))["sets"]
+    zones = {(type(s["zone"]), s["zone"]): [view["phase"] for view in s["views"]] for s in sets}
+    assert zones == {(bool, False): [1.0], (int, 0): [1.0], (float, 0.0): [2.0]}
+
+    text = output.read_text(encoding="utf-8")
+    values = re.findall(r"<VALUETYPE>(\w+)</VALUETYPE><UNIT>None</UNIT></PROPERTY><CONDITION><TYPE>NotEquals</TYPE>"
+                        r"<VALUE>([^<]*)</VALUE>", text)
+    assert set(values) == {("IntegerValue", "0"), ("BooleanValue", "False"), ("DoubleValue", "0.00000000000")}
+    assert "<TYPE>Equals</TYPE><VALUE>0.00000000000</VALUE>" in text
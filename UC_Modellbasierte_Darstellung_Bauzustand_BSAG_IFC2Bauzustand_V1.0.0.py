@@ -1,13 +1,20 @@
 # Import required libraries
-from datetime import datetime
-import ifcopenshell
+from datetime import datetime, timezone
 import customtkinter as ctk
-import darkdetect
 from tkinter import filedialog, messagebox
 import os
 import sys
 import uuid
 import getpass
+import hashlib
+import json
+import re
+import time
+import zipfile
+from array import array
+from bisect import bisect_left
+from collections import Counter, namedtuple
+from contextlib import contextmanager
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -27,6 +34,8 @@ except:
 
 # Application constants
 TITLE = "B+S AG - Modellbasierte Darstellung Bauzustand"
+TOOL_VERSION = "1.0.0"
+SMARTVIEWSET_TITLE = "UC_Modellbasierte_Darstellung_Bauzustand"
 APP_SIZE = (1300, 1000)
 FONT = "Segoe UI"
 TEXT_FONT_SIZE = 16
@@ -51,6 +60,1162 @@ COLORS = {
 BLACK = "#000000"
 WHITE = "#EEEEEE"
 
+# Status colours of the construction states (RGBA)
+STATUS_COLORS = {
+    "Bestand": (204, 204, 204, 255),
+    "Vorphase": (85, 85, 85, 255),
+    "Erstellung": (255, 0, 0, 255),
+    "Abbruch": (255, 249, 10, 255)
+}
+
+# BIMcollab ZOOM smartview file header
+ZOOM_FILE_VERSION = "6"
+ZOOM_APPLICATION_VERSION = "Win - Version: 9.2 (build 9.2.12.0)"
+
+# Viewer-neutral phase rules (see compile_phase_rules): a rule applies its action, coloured
+# with the status colour, to the elements matching all of its conditions
+RuleCondition = namedtuple(
+    "RuleCondition", "pset prop operator value source value_type", defaults=("PropertySet", "DoubleValue"))
+PhaseRule = namedtuple("PhaseRule", "conditions action status")
+
+# Rule vocabulary of the smartview backends ("undefined" matches elements without the property)
+ZOOM_CONDITIONS = {"eq": "Equals", "ne": "NotEquals", "lt": "Less", "gt": "Greater", "undefined": "Undefined"}
+ZOOM_ACTIONS = {"show": "AddSetColored", "transparent": "SetTransparent", "remove": "Remove"}
+ZOOM_VALUE_TYPES = {bool: "BooleanValue", int: "IntegerValue", float: "DoubleValue", str: "StringValue"}
+NAVISWORKS_TESTS = {
+    "eq": "equals", "ne": "not_equals", "lt": "less_than", "gt": "greater_than", "undefined": "no_prop"
+}
+NAVISWORKS_DATA_TYPES = {bool: "bool", int: "int32", float: "float", str: "wstring"}
+NAVISWORKS_ACTION_SETS = {"transparent": "Transparent", "remove": "Ausblenden"}
+NAVISWORKS_AND_FLAGS = 10
+NAVISWORKS_OR_FLAGS = 74
+XML_ATTRIBUTE = {'"': "&quot;"}
+
+# STEP (IFC-SPF) tokens: strings (with '' escapes), comments and record terminators
+STEP_TOKEN = re.compile(rb"'[^']*(?:''[^']*)*'|/\*.*?\*/|;", re.S)
+STEP_ARG_TOKEN = re.compile(rb"'[^']*(?:''[^']*)*'|#\d+|[(),]|[^'#(),]+")
+STEP_RECORD = re.compile(rb"#(\d+)\s*=\s*([A-Za-z0-9_]+)")
+STEP_STRING = re.compile(rb"'[^']*(?:''[^']*)*'")
+STEP_REF = re.compile(rb"#(\d+)")
+STEP_BLANK = re.compile(rb"(?:\s|/\*.*?\*/)*", re.S)
+STEP_STRING_ESCAPE = re.compile(
+    r"\\X2\\((?:[0-9A-Fa-f]{4})*)\\X0\\|\\X4\\((?:[0-9A-Fa-f]{8})*)\\X0\\|\\X\\([0-9A-Fa-f]{2})|\\S\\(.)|\\\\")
+
+# Parallel scan of a single IFC-SPF file: chunk size, alignment read size and the
+# property records whose values are read (True: all list values, otherwise the first value)
+SCAN_CHUNK_SIZE = 64 * 1024 * 1024
+SCAN_ALIGN_BLOCK = 1024 * 1024
+SCAN_PROPERTY_TYPES = {
+    b"IFCPROPERTYSINGLEVALUE": False,
+    b"IFCPROPERTYENUMERATEDVALUE": False,
+    b"IFCPROPERTYLISTVALUE": True
+}
+
+# Supported input formats (ifcZIP must contain an IFC-SPF file)
+IFC_EXTENSIONS = (".ifc", ".ifczip")
+HEADER_SNIFF_SIZE = 65536
+# Uncompressed size above which ifcZIP content is parsed from a temporary file instead of memory
+IFCZIP_MEMORY_LIMIT = 512 * 1024 * 1024
+STEP_FILE_SCHEMA = re.compile(rb"FILE_SCHEMA\s*\(\s*\(\s*'([^']+)'", re.I)
+
+# Deterministic output: name-based GUIDs and input fingerprint stored next to the output
+SMARTVIEW_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/BuSAG/BSAG_IFC2Bauzustand")
+FINGERPRINT_SUFFIX = ".sha256"
+
+# Partitioning of smartviews by zone: spatial element types and the BIMcollab ZOOM
+# property (name, property set, type, value type) used to filter a zone
+ZONE_MODES = {
+    "Keine": None,
+    "Geschoss": (("IfcBuildingStorey",), ("Building Storey", "Location", "Summary", "StringValue")),
+    "Bauwerksteil": (("IfcFacilityPart",), ("Facility Part", "Location", "Summary", "StringValue")),
+    "Eigenschaft": ((), None)
+}
+
+# Phase sources: element properties or the construction schedule (IfcTask via IfcRelAssignsToProcess)
+PHASE_SOURCES = ("Eigenschaften", "Terminplan (IfcTask)")
+
+# Task types that build or demolish their assigned products (other task types are ignored)
+TASK_BUILD_TYPES = {"CONSTRUCTION", "INSTALLATION", "NOTDEFINED", "USERDEFINED", None}
+TASK_DEMOLISH_TYPES = {"DEMOLITION", "REMOVAL", "DISPOSAL", "DISMANTLE"}
+
+# Property set (name, build property, demolition property) written for schedule-derived phases; a set
+# of its own, so the smartview rules never mix with phase properties the model already carries
+TASK_PHASE_PSET = ("BSAG_Terminplan", "Bauphase", "Rueckbauphase")
+
+# Relative tolerance below which two phase values count as the same phase
+PHASE_TOLERANCE = 1e-9
+NAN = float("nan")
+
+# Required entries of a generation profile (see load_profiles)
+PROFILE_KEYS = ("psets", "bauphase", "rueckbauphase", "output")
+
+# Ownership markers used by StepRecordGraph
+OWNER_NONE = -1
+OWNER_SHARED = -2
+
+
+def ifc_member_size(filepath):
+    """Uncompressed size of the IFC-SPF file inside an ifcZIP archive (from the archive directory)"""
+    with zipfile.ZipFile(filepath) as zf:
+        return zf.getinfo(ifc_member_name(zf)).file_size
+
+
+def ifc_member_name(zf):
+    """Name of the first IFC-SPF file inside an ifcZIP archive"""
+    for name in zf.namelist():
+        if name.lower().endswith(".ifc"):
+            return name
+    raise LookupError(f"Keine .ifc-Datei in {zf.filename} gefunden")
+
+
+@contextmanager
+def open_ifc_stream(filepath):
+    """Open the content of an IFC file as binary stream; ifcZIP is decompressed on the fly, never to disk"""
+    if filepath.lower().endswith(".ifczip"):
+        with zipfile.ZipFile(filepath) as zf:
+            with zf.open(ifc_member_name(zf)) as stream:
+                yield stream
+    else:
+        with open(filepath, 'rb') as stream:
+            yield stream
+
+
+def sniff_ifc_schema(filepath):
+    """Read the schema identifier from the file header (only the first bytes are decompressed)"""
+    try:
+        with open_ifc_stream(filepath) as stream:
+            head = stream.read(HEADER_SNIFF_SIZE)
+    except (OSError, LookupError, zipfile.BadZipFile):
+        return None
+    match = STEP_FILE_SCHEMA.search(head)
+    return match.group(1).decode("ascii", "replace").upper() if match else None
+
+
+def decode_ifc_text(data):
+    """Decode STEP content for ifcopenshell (UTF-8, falling back to Latin-1)"""
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+
+def deterministic_guid(*parts):
+    """Name-based GUID (UUID5) derived from the given parts"""
+    return uuid.uuid5(SMARTVIEW_NAMESPACE, "|".join(str(p) for p in parts))
+
+
+def deterministic_timestamp(files):
+    """Timestamp for deterministic output: SOURCE_DATE_EPOCH or the newest input modification time (UTC)"""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch and epoch.isdigit():
+        moment = int(epoch)
+    else:
+        moment = max((os.path.getmtime(f) for f in files if os.path.exists(f)), default=0)
+    return datetime.fromtimestamp(moment, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def content_fingerprint(inputs):
+    """SHA-256 over all inputs that influence the generated output"""
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_sha256(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_output_current(output_path, fingerprint):
+    """True if the output was generated from inputs with the same fingerprint and is unmodified since"""
+    try:
+        with open(output_path + FINGERPRINT_SUFFIX, 'r', encoding="utf-8") as f:
+            stored = f.read().split()
+        # The output hash detects files rewritten (e.g. non-deterministically) after the sidecar
+        return stored == [fingerprint, file_sha256(output_path)]
+    except OSError:
+        return False
+
+
+def write_fingerprint(output_path, fingerprint):
+    """Store the input fingerprint and the hash of the output next to the output"""
+    with open(output_path + FINGERPRINT_SUFFIX, 'w', encoding="utf-8") as f:
+        f.write(f"{fingerprint} {file_sha256(output_path)}\n")
+
+
+def remove_fingerprint(output_path):
+    """Remove the sidecar of an output that was not written deterministically"""
+    try:
+        os.remove(output_path + FINGERPRINT_SUFFIX)
+    except FileNotFoundError:
+        pass
+
+
+def load_profiles(path):
+    """Load generation profiles from a JSON or TOML file.
+
+    Each profile holds "psets", "bauphase", "rueckbauphase" (property names),
+    "output" (relative to the config file) and optionally "name", "title" and
+    "formats" (keys of SMARTVIEW_FORMATS).
+    """
+    if path.lower().endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("TOML-Profile benötigen Python 3.11 oder neuer")
+        with open(path, 'rb') as f:
+            config = tomllib.load(f)
+    else:
+        with open(path, 'r', encoding="utf-8") as f:
+            config = json.load(f)
+
+    profiles = config.get("profiles", []) if isinstance(config, dict) else config
+    base_dir = os.path.dirname(os.path.abspath(path))
+    result = []
+    if not isinstance(profiles, list):
+        raise ValueError("Profile müssen als Liste angegeben werden")
+    for i, profile in enumerate(profiles, 1):
+        if not isinstance(profile, dict):
+            raise ValueError(f"Profil {i}: Eintrag ist kein Objekt")
+        name = profile.get("name") or f"Profil {i}"
+        texts = [
+            key for key in ("name", "title", "output")
+            if profile.get(key) is not None and not isinstance(profile[key], str)
+        ]
+        if texts:
+            raise ValueError(f"Profil {i}: {', '.join(texts)} muss ein Text sein")
+        missing = [key for key in PROFILE_KEYS if not profile.get(key)]
+        if missing:
+            raise ValueError(f"Profil {name}: fehlende Angaben {', '.join(missing)}")
+        # Lists of names; a single string would otherwise be split into characters
+        lists = [
+            key for key in ("psets", "bauphase", "rueckbauphase", "formats")
+            if key in profile and not (
+                isinstance(profile[key], list) and all(isinstance(v, str) for v in profile[key]))
+        ]
+        if lists:
+            raise ValueError(f"Profil {name}: {', '.join(lists)} muss eine Liste von Namen sein")
+        unknown = [key for key in profile.get("formats", []) if key not in SMARTVIEW_FORMATS]
+        if unknown:
+            raise ValueError(f"Profil {name}: unbekannte Formate {', '.join(unknown)}")
+        result.append({
+            "name": name,
+            "title": profile.get("title", SMARTVIEWSET_TITLE),
+            "psets": list(profile["psets"]),
+            "bauphase": list(profile["bauphase"]),
+            "rueckbauphase": list(profile["rueckbauphase"]),
+            "output": os.path.join(base_dir, os.path.expanduser(profile["output"])),
+            "formats": list(profile.get("formats", []))
+        })
+    if not result:
+        raise ValueError("Keine Profile gefunden")
+    return result
+
+
+def iter_step_statements(data, start=0, end=None):
+    """Yield (start, end) byte ranges of ';'-terminated statements, ignoring ';' in strings and comments"""
+    end = len(data) if end is None else end
+    stmt_start = start
+    for token in STEP_TOKEN.finditer(data, start, end):
+        if token.group() == b";":
+            yield stmt_start, token.end()
+            stmt_start = token.end()
+
+
+def rewrite_step_record(record, drop_ids):
+    """Remove references to drop_ids from a record's lists; returns None if the record itself must go"""
+    out = []
+    depth = 0
+    removed = False
+    for token in STEP_ARG_TOKEN.findall(record):
+        if depth and not token.strip():
+            # Whitespace between arguments is insignificant and would hide the separators below
+            continue
+        if token == b"(":
+            depth += 1
+        elif token == b")":
+            depth -= 1
+            if out and out[-1] == b",":
+                out.pop()
+            if removed and out and out[-1] == b"(" and depth >= 1:
+                # Emptied list: relationships need at least one member
+                return None
+        elif token == b"," and out and out[-1] in (b"(", b","):
+            continue
+        elif token[:1] == b"#" and int(token[1:]) in drop_ids:
+            # Directly referenced (non-list) attribute cannot be removed
+            if depth <= 1:
+                return None
+            removed = True
+            continue
+        out.append(token)
+    return b"".join(out)
+
+
+class StepRecordGraph:
+    """Byte-offset index and reference graph over the DATA section of an IFC-SPF file.
+
+    The graph is built once per source model. Every record is assigned to an
+    owner: either a phase element (the record only exists for that element)
+    or OWNER_SHARED (placements, spatial structure, materials, ...). Writing a
+    subset is then a linear copy of byte ranges without further traversal.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.ids = array('q')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.ref_offsets = array('q', [0])
+        self.refs = array('q')
+        self.position = {}
+        self.owner = array('q')
+        self.rewritable = {}
+        self.runs = []
+        self.max_id = 0
+        self.data_start = 0
+        self.data_end = len(data)
+        self._index()
+
+    def _index(self):
+        """Locate the DATA section and index all records with their references"""
+        data = self.data
+        in_data = False
+        for stmt_start, stmt_end in iter_step_statements(data):
+            body_start = STEP_BLANK.match(data, stmt_start, stmt_end).end()
+            if not in_data:
+                if data[body_start:stmt_end - 1].strip() == b"DATA":
+                    in_data = True
+                    self.data_start = stmt_end
+                continue
+            match = STEP_RECORD.match(data, body_start, stmt_end)
+            if not match:
+                if data[body_start:stmt_end - 1].strip() == b"ENDSEC":
+                    self.data_end = stmt_start
+                    break
+                continue
+            record_id = int(match.group(1))
+            self.position[record_id] = len(self.ids)
+            self.ids.append(record_id)
+            self.starts.append(stmt_start)
+            self.ends.append(stmt_end)
+            body = data[match.end():stmt_end]
+            if b"'" in body:
+                body = STEP_STRING.sub(b"''", body)
+            self.refs.extend(int(r) for r in STEP_REF.findall(body))
+            self.ref_offsets.append(len(self.refs))
+            if record_id > self.max_id:
+                self.max_id = record_id
+        self.owner = array('q', [OWNER_NONE]) * len(self.ids)
+
+    def _children(self, pos):
+        """Positions of the records referenced by the record at pos"""
+        position = self.position
+        for ref in self.refs[self.ref_offsets[pos]:self.ref_offsets[pos + 1]]:
+            child = position.get(ref)
+            if child is not None:
+                yield child
+
+    def _mark(self, pos, group, elements):
+        """Assign pos (and its dependency closure) to group, degrading to shared on conflicts"""
+        owner = self.owner
+        stack = [(pos, group)]
+        while stack:
+            pos, group = stack.pop()
+            current = owner[pos]
+            if current == group or current == OWNER_SHARED:
+                continue
+            new = group if current == OWNER_NONE else OWNER_SHARED
+            owner[pos] = new
+            for child in self._children(pos):
+                if child not in elements:
+                    stack.append((child, new))
+
+    def assign_owners(self, element_ids, replaceable=()):
+        """Compute record ownership for the given phase element ids (one pass over the graph)
+
+        Records listed in replaceable (ids) may be exchanged per phase in write_subset.
+        """
+        owner = self.owner
+        elements = {self.position[e] for e in element_ids if e in self.position}
+
+        # 1. Dependency closure of each phase element
+        for pos in elements:
+            owner[pos] = self.ids[pos]
+        for pos in elements:
+            for child in self._children(pos):
+                if child not in elements:
+                    self._mark(child, self.ids[pos], elements)
+
+        # 2. Unreferenced records (relationships, styled items, layers): attach them to an element
+        #    only if everything they reference belongs to it, otherwise keep them shared and rewrite
+        #    their lists per phase (unowned children such as unphased elements stay shared)
+        referenced = bytearray(len(self.ids))
+        for ref in self.refs:
+            child = self.position.get(ref)
+            if child is not None:
+                referenced[child] = 1
+        for pos in range(len(self.ids)):
+            if referenced[pos] or pos in elements:
+                continue
+            groups = {owner[c] if owner[c] >= 0 else OWNER_SHARED for c in self._children(pos)}
+            if len(groups) == 1 and min(groups) >= 0:
+                owner[pos] = groups.pop()
+            else:
+                owner[pos] = OWNER_SHARED
+                for child in self._children(pos):
+                    if owner[child] == OWNER_NONE:
+                        self._mark(child, OWNER_SHARED, elements)
+
+        # 3. Everything else is part of the shared structure
+        for pos in range(len(self.ids)):
+            if owner[pos] == OWNER_NONE:
+                self._mark(pos, OWNER_SHARED, elements)
+
+        # Shared records that point into element-owned data are rewritten when writing a phase:
+        # {position: ((referenced id, owning element), ...)}
+        self.rewritable = {}
+        for pos in range(len(self.ids)):
+            if owner[pos] == OWNER_SHARED:
+                owned = tuple((self.ids[c], owner[c]) for c in self._children(pos) if owner[c] >= 0)
+                if owned:
+                    self.rewritable[pos] = owned
+
+        # 4. Byte runs of consecutive records with the same owner, so that writing a phase only
+        #    walks the runs; rewritable and replaceable records form runs of their own
+        single = self.rewritable.keys() | {self.position[r] for r in replaceable if r in self.position}
+        runs = []
+        for pos in range(len(self.ids)):
+            group = owner[pos]
+            if pos in single:
+                runs.append((group, self.starts[pos], self.ends[pos], pos))
+            elif runs and runs[-1][3] < 0 and runs[-1][0] == group and runs[-1][2] == self.starts[pos]:
+                runs[-1] = (group, runs[-1][1], self.ends[pos], -1)
+            else:
+                runs.append((group, self.starts[pos], self.ends[pos], -1))
+        self.runs = runs
+
+    def write_subset(self, path, standing, extra_records=(), replacements=None):
+        """Write all shared records plus the records of the standing elements to path
+
+        replacements maps record ids (passed as replaceable to assign_owners) to new records.
+        """
+        data = self.data
+        ids = self.ids
+        with open(path, 'wb') as f:
+            f.write(data[:self.data_start])
+            run_start = None
+            run_end = None
+            for group, start, end, pos in self.runs:
+                if group != OWNER_SHARED and group not in standing:
+                    continue
+                if pos >= 0:
+                    record = replacements.get(ids[pos]) if replacements else None
+                    if record is not None:
+                        record = b"\n" + record
+                    elif pos in self.rewritable:
+                        drop = {ref for ref, group in self.rewritable[pos] if group not in standing}
+                        if drop:
+                            record = rewrite_step_record(data[start:end], drop) or b""
+                    if record is not None:
+                        if run_start is not None:
+                            f.write(data[run_start:run_end])
+                            run_start = None
+                        f.write(record)
+                        continue
+                if run_start is not None and run_end == start:
+                    run_end = end
+                    continue
+                if run_start is not None:
+                    f.write(data[run_start:run_end])
+                run_start, run_end = start, end
+            if run_start is not None:
+                f.write(data[run_start:run_end])
+            for record in extra_records:
+                f.write(b"\n" + record)
+            f.write(data[self.data_end:])
+
+
+def decode_step_string(raw):
+    """Decode a quoted STEP string literal including its \\X2\\, \\X4\\, \\X\\ and \\S\\ escapes"""
+    text = decode_ifc_text(raw[1:-1].replace(b"''", b"'"))
+    if "\\" not in text:
+        return text
+
+    def unescape(match):
+        utf16, utf32, latin1, shifted = match.groups()
+        if utf16 is not None:
+            return bytes.fromhex(utf16).decode("utf-16-be", "replace")
+        if utf32 is not None:
+            return bytes.fromhex(utf32).decode("utf-32-be", "replace")
+        if latin1 is not None:
+            return chr(int(latin1, 16))
+        if shifted is not None:
+            return chr(ord(shifted) + 128)
+        return "\\"
+    return STEP_STRING_ESCAPE.sub(unescape, text)
+
+
+def parse_step_arguments(record):
+    """Parse the attribute list of a record into nested lists; typed values become (TYPE, [args])"""
+    stack = [[]]
+    for token in STEP_ARG_TOKEN.findall(record):
+        if token == b"(":
+            values = []
+            top = stack[-1]
+            if top and isinstance(top[-1], bytes) and top[-1][:1].isalpha():
+                top[-1] = (top[-1], values)
+            else:
+                top.append(values)
+            stack.append(values)
+        elif token == b")":
+            stack.pop()
+        elif token != b",":
+            token = token.strip()
+            if token:
+                stack[-1].append(token)
+    return stack[0][0] if stack[0] and isinstance(stack[0][0], list) else []
+
+
+def step_number(value):
+    """Numeric value of a parsed STEP parameter, converted like _property_numbers"""
+    if isinstance(value, tuple):
+        # Typed parameter, e.g. IFCREAL(3.) or IFCLABEL('3')
+        value = value[1][0] if value[1] else None
+    if not isinstance(value, bytes):
+        return None
+    if value[:1] == b"'":
+        text = decode_step_string(value).strip().replace(",", ".")
+    elif value in (b".T.", b".F."):
+        return 1.0 if value == b".T." else 0.0
+    elif value[:1] in (b".", b"#", b"$", b"*", b'"'):
+        return None
+    else:
+        text = value.decode("ascii", "replace")
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def step_refs(value):
+    """Record ids of a parsed reference or list of references"""
+    values = value if isinstance(value, list) else [value]
+    return [int(v[1:]) for v in values if isinstance(v, bytes) and v[:1] == b"#"]
+
+
+def ifc_subtype_names(schema, entity):
+    """Upper-case STEP names of entity and all its subtypes in the given schema"""
+    import ifcopenshell.ifcopenshell_wrapper as wrapper
+
+    pending = [wrapper.schema_by_name(schema).declaration_by_name(entity)]
+    names = []
+    while pending:
+        declaration = pending.pop()
+        names.append(declaration.name().upper())
+        pending.extend(declaration.subtypes())
+    return names
+
+
+def align_step_offset(f, pos, in_string):
+    """Offset behind the first ';' at or after pos that terminates a record.
+
+    in_string tells whether pos lies inside a string literal, i.e. whether the number of
+    quotes before pos is odd. Quotes inside comments are not expected in the DATA section.
+    """
+    f.seek(pos)
+    data = b""
+    while True:
+        block = f.read(SCAN_ALIGN_BLOCK)
+        data += block
+        start = data.find(b"'") + 1 if in_string else 0
+        if start or not in_string:
+            last = start
+            for token in STEP_TOKEN.finditer(data, start):
+                # A quote or comment start between tokens is cut off at the end of the data read so far
+                if data.find(b"'", last, token.start()) >= 0 or data.find(b"/*", last, token.start()) >= 0:
+                    break
+                if token.group() == b";":
+                    return pos + token.end()
+                last = token.end()
+        if not block:
+            return pos + len(data)
+
+
+def count_step_quotes(task):
+    """Worker: number of quote characters in a byte range of a file"""
+    path, start, end = task
+    count = 0
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(SCAN_CHUNK_SIZE, remaining))
+            if not block:
+                break
+            count += block.count(b"'")
+            remaining -= len(block)
+    return count
+
+
+def scan_step_chunk(task):
+    """Worker: extract property, property set and relationship records of one chunk into compact arrays.
+
+    Both chunk borders are first moved to the next record boundary, so neighbouring chunks
+    agree on where one ends and the next begins. Properties and property sets are only kept
+    if their name is part of the selection.
+    """
+    path, start, end, start_in_string, end_in_string, pset_names, prop_names, type_names = task
+    pset_index = {name: i for i, name in enumerate(pset_names)}
+    prop_index = {name: i for i, name in enumerate(prop_names)}
+    result = {key: array('q') for key in (
+        "prop_ids", "prop_names", "value_offsets", "pset_ids", "pset_names", "pset_offsets", "pset_refs",
+        "rel_psets", "rel_counts", "typed_types", "typed_counts", "type_ids", "type_offsets", "type_refs")}
+    result["values"] = array('d')
+    for key in ("value_offsets", "pset_offsets", "type_offsets"):
+        result[key].append(0)
+    result["records"] = 0
+    names = {}
+
+    def lookup(raw, index):
+        """Selection index of a quoted name; decoded names are cached as they repeat a lot"""
+        if not isinstance(raw, bytes):
+            return None
+        if raw not in names:
+            names[raw] = decode_step_string(raw) if raw[:1] == b"'" else None
+        return index.get(names[raw])
+
+    with open(path, 'rb') as f:
+        if start > 0:
+            start = align_step_offset(f, start, start_in_string)
+        if end_in_string is not None:
+            end = align_step_offset(f, end, end_in_string)
+        if start >= end:
+            return result
+        f.seek(start)
+        data = f.read(end - start)
+
+    for stmt_start, stmt_end in iter_step_statements(data):
+        match = STEP_RECORD.match(data, STEP_BLANK.match(data, stmt_start, stmt_end).end(), stmt_end)
+        if not match:
+            continue
+        result["records"] += 1
+        entity = match.group(2).upper()
+        record_id = int(match.group(1))
+
+        if entity in SCAN_PROPERTY_TYPES:
+            # Cheap name check before parsing the whole record
+            name = STEP_STRING.search(data, match.end(), stmt_end)
+            if not name or lookup(name.group(), prop_index) is None:
+                continue
+            args = parse_step_arguments(data[match.end():stmt_end])
+            name = lookup(args[0], prop_index) if args else None
+            if name is None:
+                continue
+            value = args[2] if len(args) > 2 else None
+            items = value if isinstance(value, list) else [value]
+            if not SCAN_PROPERTY_TYPES[entity]:
+                items = items[:1]
+            result["prop_ids"].append(record_id)
+            result["prop_names"].append(name)
+            result["values"].extend(n for n in (step_number(v) for v in items) if n is not None)
+            result["value_offsets"].append(len(result["values"]))
+
+        elif entity == b"IFCPROPERTYSET":
+            args = parse_step_arguments(data[match.end():stmt_end])
+            name = lookup(args[2], pset_index) if len(args) > 4 else None
+            if name is None:
+                continue
+            result["pset_ids"].append(record_id)
+            result["pset_names"].append(name)
+            result["pset_refs"].extend(step_refs(args[4]))
+            result["pset_offsets"].append(len(result["pset_refs"]))
+
+        elif entity == b"IFCRELDEFINESBYPROPERTIES" or (type_names and entity == b"IFCRELDEFINESBYTYPE"):
+            args = parse_step_arguments(data[match.end():stmt_end])
+            relating = step_refs(args[5] if len(args) > 5 and isinstance(args[5], bytes) else None)
+            if not relating:
+                continue
+            related = len(set(step_refs(args[4])))
+            if entity == b"IFCRELDEFINESBYPROPERTIES":
+                result["rel_psets"].append(relating[0])
+                result["rel_counts"].append(related)
+            else:
+                result["typed_types"].append(relating[0])
+                result["typed_counts"].append(related)
+
+        elif entity in type_names:
+            args = parse_step_arguments(data[match.end():stmt_end])
+            result["type_ids"].append(record_id)
+            result["type_refs"].extend(step_refs(args[5] if len(args) > 5 else None))
+            result["type_offsets"].append(len(result["type_refs"]))
+    return result
+
+
+def scan_phase_values(path, pairs, workers=None, type_names=()):
+    """Values of (pset, property) pairs in one IFC-SPF file, scanned in parallel byte-range chunks.
+
+    Yields the same distinct values as the object-based traversal: only property sets assigned
+    to at least one object count. type_names are the type entities whose property sets are
+    inherited through IfcRelDefinesByType. Returns ({pair: PhaseCollector}, record count, chunk count).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    count = max(workers, -(-size // SCAN_CHUNK_SIZE))
+    bounds = [size * i // count for i in range(count + 1)]
+    pset_names = sorted({pset for pset, _ in pairs})
+    prop_names = sorted({prop for _, prop in pairs})
+    type_names = frozenset(name.encode("ascii") for name in type_names)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # 1. Quote parity at every chunk border tells whether it lies inside a string
+        quotes = pool.map(count_step_quotes, [(path, bounds[i], bounds[i + 1]) for i in range(count)])
+        in_string = [False]
+        for quote_count in quotes:
+            in_string.append((quote_count % 2 == 1) != in_string[-1])
+        in_string[-1] = None
+
+        # 2. Record extraction per aligned chunk
+        tasks = [
+            (path, bounds[i], bounds[i + 1], in_string[i], in_string[i + 1], pset_names, prop_names, type_names)
+            for i in range(count)
+        ]
+        chunks = list(pool.map(scan_step_chunk, tasks))
+
+    # 3. Resolve references across chunks: properties, property sets and type objects by id
+    properties = {}
+    property_sets = {}
+    type_sets = {}
+    for chunk in chunks:
+        offsets = chunk["value_offsets"]
+        for i, prop_id in enumerate(chunk["prop_ids"]):
+            properties[prop_id] = (prop_names[chunk["prop_names"][i]], chunk["values"][offsets[i]:offsets[i + 1]])
+        offsets = chunk["pset_offsets"]
+        for i, pset_id in enumerate(chunk["pset_ids"]):
+            property_sets[pset_id] = (pset_names[chunk["pset_names"][i]], chunk["pset_refs"][offsets[i]:offsets[i + 1]])
+        offsets = chunk["type_offsets"]
+        for i, type_id in enumerate(chunk["type_ids"]):
+            type_sets[type_id] = chunk["type_refs"][offsets[i]:offsets[i + 1]]
+
+    values = {pair: PhaseCollector() for pair in pairs}
+
+    def add_property_set(pset_id, objects):
+        """Add the values of a property set that is assigned to at least one object"""
+        pset = property_sets.get(pset_id)
+        if pset is None or not objects:
+            return
+        pset_name, refs = pset
+        for ref in refs:
+            prop = properties.get(ref)
+            target = values.get((pset_name, prop[0])) if prop else None
+            if target is not None:
+                target.update(prop[1])
+
+    for chunk in chunks:
+        for pset_id, objects in zip(chunk["rel_psets"], chunk["rel_counts"]):
+            add_property_set(pset_id, objects)
+        for type_id, objects in zip(chunk["typed_types"], chunk["typed_counts"]):
+            for pset_id in type_sets.get(type_id, ()):
+                add_property_set(pset_id, objects)
+    return values, sum(chunk["records"] for chunk in chunks), count
+
+
+def compile_phase_rules(phase, bauphase_props, rueckbau_props):
+    """Ordered viewer-neutral rules of one phase (statuses as in element_state)"""
+    if phase == 0:
+        # Existing condition: elements with Bauphase = 0
+        return [
+            PhaseRule((RuleCondition(pset, prop, "eq", phase),), "show", "Bestand")
+            for pset, prop in bauphase_props
+        ]
+
+    rules = []
+    # Elements that are neither built nor demolished yet
+    for b_pset, b_prop in bauphase_props:
+        for r_pset, r_prop in rueckbau_props:
+            rules.append(PhaseRule(
+                (RuleCondition(b_pset, b_prop, "eq", 0.0), RuleCondition(r_pset, r_prop, "eq", 0.0)),
+                "show", "Bestand"))
+            rules.append(PhaseRule(
+                (RuleCondition(b_pset, b_prop, "eq", 0.0), RuleCondition(r_pset, r_prop, "gt", phase)),
+                "show", "Bestand"))
+
+    # Elements built in previous phases and in the current phase
+    for pset, prop in bauphase_props:
+        rules.append(PhaseRule(
+            (RuleCondition(pset, prop, "lt", phase), RuleCondition(pset, prop, "gt", 0.0)), "show", "Vorphase"))
+        rules.append(PhaseRule((RuleCondition(pset, prop, "eq", phase),), "show", "Erstellung"))
+
+    # Elements demolished in the current phase (transparent) and in previous phases (removed)
+    for pset, prop in rueckbau_props:
+        rules.append(PhaseRule((RuleCondition(pset, prop, "eq", phase),), "show", "Abbruch"))
+        rules.append(PhaseRule((RuleCondition(pset, prop, "eq", phase),), "transparent", None))
+        rules.append(PhaseRule(
+            (RuleCondition(pset, prop, "lt", phase), RuleCondition(pset, prop, "ne", 0.0)), "remove", None))
+    return rules
+
+
+def bcsv_value(value, phase, value_type="DoubleValue"):
+    """ZOOM notation of a condition value; a zero phase value is written with eleven decimals"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        from xml.sax.saxutils import escape
+        return escape(value)
+    # Integer and boolean values (e.g. zones) keep their plain notation
+    if value_type == "DoubleValue" and type(value) is float and value == 0 and phase != 0:
+        return "0.00000000000"
+    return str(value)
+
+
+def write_bcsv(ruleset, f):
+    """Backend: BIMcollab ZOOM smartview file (.bcsv)"""
+    # Loaded on first use: xml.sax pulls in urllib and would slow down the start
+    from xml.sax.saxutils import escape
+
+    def w(text, level=0):
+        """Write indented XML line"""
+        f.write(("    " * level) + text + "\n")
+
+    w('<?xml version="1.0"?>')
+    w('<bimcollabsmartviewfile>')
+    w(f'<version>{ZOOM_FILE_VERSION}</version>', 1)
+    w(f'<applicationversion>{ZOOM_APPLICATION_VERSION}</applicationversion>', 1)
+    w('</bimcollabsmartviewfile>')
+    w('<SMARTVIEWSETS>')
+    for smartview_set in ruleset["sets"]:
+        w('<SMARTVIEWSET>', 1)
+        w(f'<TITLE>{escape(smartview_set["title"])}</TITLE>', 2)
+        w(f'<DESCRIPTION>{escape(smartview_set["title"])}</DESCRIPTION>', 2)
+        w(f'<GUID>{smartview_set["guid"]}</GUID>', 2)
+        w(f'<MODIFICATIONDATE>{ruleset["date"]}</MODIFICATIONDATE>', 2)
+        w('<SMARTVIEWS>', 2)
+        for view in smartview_set["views"]:
+            w('<SMARTVIEW>', 3)
+            w(f'<TITLE>{escape(view["title"])}</TITLE>', 4)
+            w('<DESCRIPTION></DESCRIPTION>', 4)
+            w(f'<CREATOR>{escape(ruleset["creator"])}</CREATOR>', 4)
+            w(f'<CREATIONDATE>{ruleset["date"]}</CREATIONDATE>', 4)
+            w(f'<MODIFIER>{escape(ruleset["creator"])}</MODIFIER>', 4)
+            w(f'<MODIFICATIONDATE>{ruleset["date"]}</MODIFICATIONDATE>', 4)
+            w(f'<GUID>{view["guid"]}</GUID>', 4)
+            w('<RULES>', 4)
+            # Every condition but the last of a rule is chained with "And..."
+            for rule in view["rules"]:
+                for i, condition in enumerate(rule.conditions):
+                    last = i == len(rule.conditions) - 1
+                    action = f"<TYPE>{ZOOM_ACTIONS[rule.action] if last else 'And...'}</TYPE>"
+                    if last and rule.status is not None:
+                        r, g, b, a = STATUS_COLORS[rule.status]
+                        action += f"<R>{r}</R><G>{g}</G><B>{b}</B><A>{a}</A>"
+                    w(
+                        "<RULE><IFCTYPE>Any</IFCTYPE><PROPERTY>"
+                        f"<NAME>{escape(condition.prop)}</NAME>"
+                        f"<PROPERTYSETNAME>{escape(condition.pset)}</PROPERTYSETNAME>"
+                        f"<TYPE>{condition.source}</TYPE><VALUETYPE>{condition.value_type}</VALUETYPE><UNIT>None</UNIT>"
+                        "</PROPERTY><CONDITION>"
+                        f"<TYPE>{ZOOM_CONDITIONS[condition.operator]}</TYPE>"
+                        f"<VALUE>{bcsv_value(condition.value, view['phase'], condition.value_type)}</VALUE>"
+                        f"</CONDITION><ACTION>{action}</ACTION></RULE>",
+                        5
+                    )
+            w('</RULES>', 4)
+            w('<INFORMATIONTAKEOFF><PROPERTYSETNAME>None</PROPERTYSETNAME><PROPERTYNAME>None</PROPERTYNAME>'
+              '<OPERATION>0</OPERATION></INFORMATIONTAKEOFF>', 4)
+            w('<EXPLODEMODE>KeepParentsAndChildren</EXPLODEMODE>', 4)
+            w('</SMARTVIEW>', 3)
+        w('</SMARTVIEWS>', 2)
+        w('</SMARTVIEWSET>', 1)
+    w('</SMARTVIEWSETS>')
+
+
+def write_navisworks_xml(ruleset, f):
+    """Backend: Navisworks search sets (exchange XML), one folder per phase and one set per action.
+
+    Navisworks applies no actions of its own: the sets of a phase are named after the status
+    (or "Transparent"/"Ausblenden") and can be used in the Appearance Profiler or hidden.
+    """
+    from xml.sax.saxutils import escape
+
+    def w(text, level=0):
+        """Write indented XML line"""
+        f.write(("  " * level) + text + "\n")
+
+    def set_name(rule):
+        """Name of the search set a rule belongs to"""
+        return rule.status or NAVISWORKS_ACTION_SETS[rule.action]
+
+    w('<?xml version="1.0" encoding="UTF-8"?>')
+    w('<exchange xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+      'xsi:noNamespaceSchemaLocation="http://download.autodesk.com/us/navisworks/schemas/nw-exchange-12.0.xsd" '
+      'units="m" filename="" filepath="">')
+    w('<selectionsets>', 1)
+    for smartview_set in ruleset["sets"]:
+        w(f'<viewfolder name="{escape(smartview_set["title"], XML_ATTRIBUTE)}" guid="{smartview_set["guid"]}">', 2)
+        for view in smartview_set["views"]:
+            w(f'<viewfolder name="{escape(view["title"], XML_ATTRIBUTE)}" guid="{view["guid"]}">', 3)
+            # Rules with the same status form one search set; each rule starts a new OR group
+            names = list(dict.fromkeys(set_name(rule) for rule in view["rules"]))
+            for name in names:
+                guid = deterministic_guid(view["guid"], name)
+                w(f'<selectionset name="{escape(name, XML_ATTRIBUTE)}" guid="{guid}">', 4)
+                w('<findspec mode="all" disjoint="0">', 5)
+                w('<conditions>', 6)
+                first = True
+                for rule in view["rules"]:
+                    if set_name(rule) != name:
+                        continue
+                    for i, condition in enumerate(rule.conditions):
+                        flags = NAVISWORKS_OR_FLAGS if i == 0 and not first else NAVISWORKS_AND_FLAGS
+                        w(f'<condition test="{NAVISWORKS_TESTS[condition.operator]}" flags="{flags}">', 7)
+                        w(f'<category><name>{escape(condition.pset)}</name></category>', 8)
+                        w(f'<property><name>{escape(condition.prop)}</name></property>', 8)
+                        if condition.value is not None:
+                            data_type = NAVISWORKS_DATA_TYPES.get(type(condition.value), "wstring")
+                            w(f'<value><data type="{data_type}">{escape(str(condition.value))}</data></value>', 8)
+                        w('</condition>', 7)
+                    first = False
+                w('</conditions>', 6)
+                w('<locator>/</locator>', 6)
+                w('</findspec>', 5)
+                w('</selectionset>', 4)
+            w('</viewfolder>', 3)
+        w('</viewfolder>', 2)
+    w('</selectionsets>', 1)
+    w('</exchange>')
+
+
+def write_json(ruleset, f):
+    """Backend: plain JSON of the compiled rules (e.g. for dashboards)"""
+    data = {
+        "tool_version": TOOL_VERSION,
+        "title": ruleset["title"],
+        "creator": ruleset["creator"],
+        "date": ruleset["date"],
+        "status_colors": STATUS_COLORS,
+        "sets": [
+            {
+                "title": smartview_set["title"],
+                "guid": str(smartview_set["guid"]),
+                "zone": smartview_set["zone"],
+                "views": [
+                    {
+                        "title": view["title"],
+                        "guid": str(view["guid"]),
+                        "phase": view["phase"],
+                        "rules": [
+                            {
+                                "conditions": [condition._asdict() for condition in rule.conditions],
+                                "action": rule.action,
+                                "status": rule.status
+                            }
+                            for rule in view["rules"]
+                        ]
+                    }
+                    for view in smartview_set["views"]
+                ]
+            }
+            for smartview_set in ruleset["sets"]
+        ]
+    }
+    json.dump(data, f, ensure_ascii=False, indent=2)
+    f.write("\n")
+
+
+# Smartview backends: format key -> (label, file extension, writer)
+SMARTVIEW_FORMATS = {
+    "bcsv": ("BIMcollab ZOOM", ".bcsv", write_bcsv),
+    "navisworks": ("Navisworks Suchsets", ".xml", write_navisworks_xml),
+    "json": ("JSON", ".json", write_json)
+}
+
+# Output vocabulary of each backend; part of the fingerprint so that changing it rewrites the files
+SMARTVIEW_PARAMETERS = {
+    "bcsv": (ZOOM_FILE_VERSION, ZOOM_APPLICATION_VERSION, ZOOM_CONDITIONS, ZOOM_ACTIONS, ZOOM_VALUE_TYPES,
+             STATUS_COLORS),
+    "navisworks": (NAVISWORKS_TESTS, NAVISWORKS_DATA_TYPES, NAVISWORKS_ACTION_SETS, NAVISWORKS_AND_FLAGS,
+                   NAVISWORKS_OR_FLAGS),
+    "json": (STATUS_COLORS,)
+}
+
+
+def element_state(bauphase, rueckbauphase, phase):
+    """Return the status of an element at a phase, or None if it is not standing"""
+    if rueckbauphase is not None and 0 < rueckbauphase < phase:
+        return None
+    if bauphase is not None and bauphase > phase:
+        return None
+    if rueckbauphase is not None and rueckbauphase > 0 and rueckbauphase == phase:
+        return "Abbruch"
+    if bauphase is None:
+        return "Unverändert"
+    if bauphase == 0:
+        return "Bestand"
+    if bauphase == phase:
+        return "Erstellung"
+    return "Vorphase"
+
+
+def ifc_schedule_date(value):
+    """ISO date of an IfcDateTime (IFC4) or IfcCalendarDate/IfcDateAndTime (IFC2x3), None if unknown"""
+    if value is None or isinstance(value, str):
+        return value or None
+    clock = None
+    if value.is_a("IfcDateAndTime"):
+        value, clock = value.DateComponent, value.TimeComponent
+    if not value.is_a("IfcCalendarDate"):
+        return None
+    date = f"{value.YearComponent:04d}-{value.MonthComponent:02d}-{value.DayComponent:02d}"
+    if clock is not None:
+        date += f"T{clock.HourComponent:02d}:{clock.MinuteComponent or 0:02d}:{int(clock.SecondComponent or 0):02d}"
+    return date
+
+
+def rank_schedule_dates(dates):
+    """Phase of every task start date: its rank among all dates (1.0 for the earliest)"""
+    return {start: float(i) for i, start in enumerate(sorted(set(dates)), 1)}
+
+
+def append_step_records(data, path, records):
+    """Write STEP content to path with records appended at the end of the DATA section"""
+    end = data.rfind(b"ENDSEC")
+    with open(path, 'wb') as f:
+        f.write(data[:end])
+        for record in records:
+            f.write(record.encode("utf-8") + b"\n")
+        f.write(data[end:])
+
+
+class PhaseCollector:
+    """Distinct phase values, deduplicated on insertion into a sorted float array"""
+
+    __slots__ = ("values", "tolerance")
+
+    def __init__(self, values=(), tolerance=PHASE_TOLERANCE):
+        self.values = array('d')
+        self.tolerance = tolerance
+        self.update(values)
+
+    def add(self, value):
+        """Insert a value unless an equal one (within the tolerance) is present; returns True if new"""
+        if value != value:
+            return False
+        values = self.values
+        i = bisect_left(values, value)
+        tolerance = self.tolerance * max(1.0, abs(value))
+        if (i < len(values) and values[i] - value <= tolerance) or (i and value - values[i - 1] <= tolerance):
+            return False
+        values.insert(i, value)
+        return True
+
+    def update(self, values):
+        """Add several values (numbers or another collector)"""
+        for value in values:
+            self.add(value)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class PropertyStats:
+    """Preview statistics of one property: elements carrying it, how many numerically, value counts"""
+
+    __slots__ = ("elements", "numeric", "values")
+
+    def __init__(self):
+        self.elements = 0
+        self.numeric = 0
+        self.values = Counter()
+
+
+class ElementPhases:
+    """Array-backed {element id: (Bauphase, Rueckbauphase)}; a missing phase is stored as NaN"""
+
+    __slots__ = ("ids", "bau", "rueck")
+
+    def __init__(self):
+        self.ids = array('q')
+        self.bau = array('d')
+        self.rueck = array('d')
+
+    def add(self, element_id, bau, rueck):
+        """Append the phases of one element (None for a missing phase)"""
+        self.ids.append(element_id)
+        self.bau.append(NAN if bau is None else bau)
+        self.rueck.append(NAN if rueck is None else rueck)
+
+    def keys(self):
+        """Element ids"""
+        return self.ids
+
+    def values(self):
+        """(Bauphase, Rueckbauphase) of each element"""
+        for bau, rueck in zip(self.bau, self.rueck):
+            yield (None if bau != bau else bau, None if rueck != rueck else rueck)
+
+    def items(self):
+        """(element id, (Bauphase, Rueckbauphase)) of each element"""
+        return zip(self.ids, self.values())
+
+    def phase_values(self):
+        """Collector of all phases occurring in the elements"""
+        collector = PhaseCollector(self.bau)
+        collector.update(self.rueck)
+        return collector
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB, None if the platform does not report it"""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize / 1024 / 1024
+    except (AttributeError, OSError):
+        pass
+    return None
+
+
+def finalize_phases(values):
+    """Sort and deduplicate phase values (within PHASE_TOLERANCE) and add the final phase (one more than the last)"""
+    phases = list(values if isinstance(values, PhaseCollector) else PhaseCollector(values))
+    if len(phases) >= 2:
+        phases.append(phases[-1] + 1)
+    return phases
+
 class BIMcollabGUI(ctk.CTk):
     """Main GUI class for BIMcollab smartview generation from IFC files"""
     
@@ -78,6 +1243,14 @@ class BIMcollabGUI(ctk.CTk):
         self.bauphase_vars = {}
         self.rueckbauphase_vars = {}
         self.ifc_schemas = {}
+        self.export_status_colors = ctk.BooleanVar(value=True)
+        self.deterministic_output = ctk.BooleanVar(value=False)
+        self.parallel_scan = ctk.BooleanVar(value=False)
+        self.output_formats = {key: ctk.BooleanVar(value=key == "bcsv") for key in SMARTVIEW_FORMATS}
+        self.zone_mode = ctk.StringVar(value="Keine")
+        self.zone_grouping = ctk.StringVar()
+        self.phase_source = ctk.StringVar(value=PHASE_SOURCES[0])
+        self.ifc_projects = {}
 
         # Build the GUI
         self.setup_gui()
@@ -178,6 +1351,23 @@ class BIMcollabGUI(ctk.CTk):
         )
         self.standard_check.grid(row=1, column=0, sticky="w", padx=10, pady=(5, 10))
 
+        # Phase source (properties or construction schedule)
+        source_label = ctk.CTkLabel(attr_frame, text="Phasenquelle", font=main_font)
+        source_label.grid(row=1, column=1, sticky="e", padx=(20, 10), pady=(5, 10))
+
+        source_menu = ctk.CTkOptionMenu(
+            attr_frame,
+            values=list(PHASE_SOURCES),
+            variable=self.phase_source,
+            font=main_font,
+            corner_radius=STYLING["corner-radius"],
+            fg_color=COLORS["B+S"]["fg"],
+            button_color=COLORS["B+S"]["fg"],
+            button_hover_color=COLORS["B+S"]["hover"],
+            text_color=COLORS["B+S"]["text"]
+        )
+        source_menu.grid(row=1, column=2, sticky="w", pady=(5, 10))
+
         # Custom property selection section (3 columns)
         custom_frame = ctk.CTkFrame(main, fg_color="transparent")
         custom_frame.grid(row=4, column=0, columnspan=3, sticky="nsew", pady=5, padx=10)
@@ -207,6 +1397,14 @@ class BIMcollabGUI(ctk.CTk):
         self.rueckbauphase_frame = ctk.CTkScrollableFrame(custom_frame, fg_color=("gray90", "gray13"), corner_radius=STYLING["corner-radius"])
         self.rueckbauphase_frame.grid(row=1, column=2, sticky="nsew", padx=2, pady=5)
 
+        # Live preview of the current selection
+        preview_label = ctk.CTkLabel(custom_frame, text="Vorschau", font=main_font)
+        preview_label.grid(row=2, column=0, sticky="w", padx=5, pady=(5, 0))
+
+        self.preview_text = ctk.CTkTextbox(custom_frame, height=120, font=main_font, corner_radius=STYLING["corner-radius"])
+        self.preview_text.grid(row=3, column=0, columnspan=3, sticky="ew", padx=2, pady=5)
+        self.preview_text.configure(state="disabled")
+
         # Output path section
         out_frame = ctk.CTkFrame(main, fg_color="transparent")
         out_frame.grid(row=5, column=0, columnspan=3, sticky="ew", pady=5, padx=10)
@@ -238,6 +1436,87 @@ class BIMcollabGUI(ctk.CTk):
         )
         browse_btn.grid(row=1, column=1, sticky="ew", padx=(5, 10), pady=(5, 10))
 
+        # Deterministic output checkbox
+        deterministic_check = ctk.CTkCheckBox(
+            out_frame,
+            text="Deterministische Ausgabe (nur bei Änderungen neu schreiben)",
+            variable=self.deterministic_output,
+            font=main_font,
+            corner_radius=STYLING["corner-radius"],
+            fg_color=COLORS["B+S"]["fg"],
+            hover_color=COLORS["B+S"]["hover"],
+            checkbox_width=STYLING["checkbox-size"],
+            checkbox_height=STYLING["checkbox-size"]
+        )
+        deterministic_check.grid(row=2, column=0, columnspan=2, sticky="w", padx=10, pady=(0, 10))
+
+        # Parallel scan of single large files
+        parallel_check = ctk.CTkCheckBox(
+            out_frame,
+            text=f"Große IFC-Dateien parallel einlesen ({os.cpu_count() or 1} Prozessorkerne)",
+            variable=self.parallel_scan,
+            font=main_font,
+            corner_radius=STYLING["corner-radius"],
+            fg_color=COLORS["B+S"]["fg"],
+            hover_color=COLORS["B+S"]["hover"],
+            checkbox_width=STYLING["checkbox-size"],
+            checkbox_height=STYLING["checkbox-size"]
+        )
+        parallel_check.grid(row=4, column=0, columnspan=2, sticky="w", padx=10, pady=(0, 10))
+
+        # Output formats (written next to the output path with their own extension)
+        format_frame = ctk.CTkFrame(out_frame, fg_color="transparent")
+        format_frame.grid(row=5, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 10))
+
+        format_label = ctk.CTkLabel(format_frame, text="Formate", font=main_font)
+        format_label.grid(row=0, column=0, sticky="w", padx=(0, 10))
+        for column, (key, (label, extension, _)) in enumerate(SMARTVIEW_FORMATS.items(), 1):
+            format_check = ctk.CTkCheckBox(
+                format_frame,
+                text=f"{label} ({extension})",
+                variable=self.output_formats[key],
+                font=main_font,
+                corner_radius=STYLING["corner-radius"],
+                fg_color=COLORS["B+S"]["fg"],
+                hover_color=COLORS["B+S"]["hover"],
+                checkbox_width=STYLING["checkbox-size"],
+                checkbox_height=STYLING["checkbox-size"]
+            )
+            format_check.grid(row=0, column=column, sticky="w", padx=(0, 10))
+
+        # Zone partitioning (spatial structure or grouping property)
+        zone_frame = ctk.CTkFrame(out_frame, fg_color="transparent")
+        zone_frame.grid(row=3, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 10))
+        zone_frame.columnconfigure(3, weight=1)
+
+        zone_label = ctk.CTkLabel(zone_frame, text="Aufteilung nach", font=main_font)
+        zone_label.grid(row=0, column=0, sticky="w", padx=(0, 10))
+
+        zone_menu = ctk.CTkOptionMenu(
+            zone_frame,
+            values=list(ZONE_MODES),
+            variable=self.zone_mode,
+            font=main_font,
+            corner_radius=STYLING["corner-radius"],
+            fg_color=COLORS["B+S"]["fg"],
+            button_color=COLORS["B+S"]["fg"],
+            button_hover_color=COLORS["B+S"]["hover"],
+            text_color=COLORS["B+S"]["text"]
+        )
+        zone_menu.grid(row=0, column=1, sticky="w", padx=(0, 10))
+
+        # Grouping property entry (used for "Eigenschaft")
+        grouping_label = ctk.CTkLabel(zone_frame, text="Gruppierung (PropertySet.Property)", font=main_font)
+        grouping_label.grid(row=0, column=2, sticky="e", padx=(0, 10))
+
+        zone_entry = ctk.CTkEntry(
+            zone_frame,
+            textvariable=self.zone_grouping,
+            font=main_font,
+            corner_radius=STYLING["corner-radius"]
+        )
+        zone_entry.grid(row=0, column=3, sticky="ew")
+
         # Create smartviews button
         create_btn = ctk.CTkButton(
             main, 
@@ -252,9 +1531,55 @@ class BIMcollabGUI(ctk.CTk):
         )
         create_btn.grid(row=6, column=0, columnspan=3, pady=10, padx=10, sticky="ew")
 
+        # Additional actions section (profiles, construction state export)
+        action_frame = ctk.CTkFrame(main, fg_color="transparent")
+        action_frame.grid(row=7, column=0, columnspan=3, sticky="ew", pady=(0, 5), padx=10)
+        action_frame.columnconfigure(0, weight=1)
+        action_frame.columnconfigure(1, weight=1)
+
+        # Run profiles from config file button
+        profiles_btn = ctk.CTkButton(
+            action_frame,
+            text="Profile ausführen...",
+            command=self.run_profiles,
+            font=main_font,
+            corner_radius=STYLING["corner-radius"],
+            fg_color=COLORS["B+S"]["fg"],
+            hover_color=COLORS["B+S"]["hover"],
+            text_color=COLORS["B+S"]["text"]
+        )
+        profiles_btn.grid(row=0, column=0, sticky="ew", padx=(0, 10))
+
+        # Export one IFC file per phase button
+        export_btn = ctk.CTkButton(
+            action_frame,
+            text="Bauzustände als IFC exportieren",
+            command=self.export_phase_states,
+            font=main_font,
+            corner_radius=STYLING["corner-radius"],
+            fg_color=COLORS["B+S"]["fg"],
+            hover_color=COLORS["B+S"]["hover"],
+            text_color=COLORS["B+S"]["text"]
+        )
+        export_btn.grid(row=0, column=1, sticky="ew", padx=(0, 10))
+
+        # Status colours as styled items checkbox
+        colors_check = ctk.CTkCheckBox(
+            action_frame,
+            text="Statusfarben einfärben",
+            variable=self.export_status_colors,
+            font=main_font,
+            corner_radius=STYLING["corner-radius"],
+            fg_color=COLORS["B+S"]["fg"],
+            hover_color=COLORS["B+S"]["hover"],
+            checkbox_width=STYLING["checkbox-size"],
+            checkbox_height=STYLING["checkbox-size"]
+        )
+        colors_check.grid(row=0, column=2, sticky="w")
+
         # Status log section
         status_frame = ctk.CTkFrame(main, fg_color="transparent")
-        status_frame.grid(row=7, column=0, columnspan=3, sticky="nsew", pady=5, padx=10)
+        status_frame.grid(row=8, column=0, columnspan=3, sticky="nsew", pady=5, padx=10)
         status_frame.columnconfigure(0, weight=1)
         status_frame.rowconfigure(1, weight=1)
         
@@ -276,11 +1601,11 @@ class BIMcollabGUI(ctk.CTk):
                           "Anspruch auf Vollstaendigkeit oder offizielle Validierung durch buildingSMART oder andere Institutionen.")
         
         disclaimer_label = ctk.CTkLabel(main, text=disclaimer_text, font=disclaimer_font, justify="left", wraplength=1260)
-        disclaimer_label.grid(row=8, column=0, columnspan=3, sticky="ew", padx=10, pady=(5, 10))
+        disclaimer_label.grid(row=9, column=0, columnspan=3, sticky="ew", padx=10, pady=(5, 10))
 
         # Configure row weights for resizing
         main.rowconfigure(4, weight=1)
-        main.rowconfigure(7, weight=1)
+        main.rowconfigure(8, weight=1)
         
         # Initialize GUI state
         self.toggle_standard()
@@ -308,6 +1633,51 @@ class BIMcollabGUI(ctk.CTk):
             if isinstance(widget, ctk.CTkCheckBox):
                 widget.configure(state=state)
 
+        self.update_preview()
+
+    def update_preview(self):
+        """Show match counts and resulting phases of the current selection (from the preview index)"""
+        start = time.perf_counter()
+        if self.use_standard_attribution.get():
+            psets, props_bau, props_rueck = ["CH_Ing_Uebergeordnet"], ["Bauphase"], ["Rueckbauphase"]
+        else:
+            psets = [p for p, v in self.pset_vars.items() if v.get()]
+            props_bau = [p for p, v in self.bauphase_vars.items() if v.get()]
+            props_rueck = [p for p, v in self.rueckbauphase_vars.items() if v.get()]
+
+        lines = []
+        built = Counter()
+        demolished = Counter()
+        for props, target, label in ((props_bau, built, "Bauphase"), (props_rueck, demolished, "Rückbauphase")):
+            for pset in psets:
+                for prop in props:
+                    stats = self.pset_properties.get(pset, {}).get(prop)
+                    if stats is None:
+                        lines.append(f"{label} {pset}.{prop}: keine Elemente")
+                        continue
+                    ratio = stats.numeric / stats.elements * 100 if stats.elements else 0
+                    lines.append(f"{label} {pset}.{prop}: {stats.elements} Elemente, {ratio:.0f}% numerisch")
+                    target.update(stats.values)
+
+        phases = finalize_phases(list(built) + list(demolished))
+        if phases:
+            lines.append(f"{len(phases)} Phasen:")
+            for i, phase in enumerate(phases):
+                # Rueckbauphase 0 means "not demolished"
+                removed = demolished.get(phase, 0) if phase != 0 else 0
+                lines.append(f"  Phase {self.phase_title(phase, i, len(phases))}: "
+                             f"{built.get(phase, 0)} erstellt, {removed} rückgebaut")
+        elif psets and (props_bau or props_rueck):
+            lines.append("Keine Phasen gefunden")
+        else:
+            lines.append("Keine Auswahl")
+        lines.append(f"(aktualisiert in {(time.perf_counter() - start) * 1000:.0f} ms)")
+
+        self.preview_text.configure(state="normal")
+        self.preview_text.delete("1.0", "end")
+        self.preview_text.insert("end", "\n".join(lines))
+        self.preview_text.configure(state="disabled")
+
     def detect_ifc_schema(self, ifc_file):
         """Detect IFC schema version from the file"""
         try:
@@ -330,7 +1700,13 @@ class BIMcollabGUI(ctk.CTk):
 
     def open_ifc_file_safely(self, filepath):
         """Safely open IFC file with fallback for unsupported schemas"""
+        # Loaded on first use so the window paints before the IFC machinery is touched
+        import ifcopenshell
+
+        compressed_step = filepath.lower().endswith(".ifczip")
         try:
+            if compressed_step:
+                return self.open_ifczip(filepath)
             return ifcopenshell.open(filepath)
         except Exception as e:
             error_msg = str(e).lower()
@@ -340,6 +1716,13 @@ class BIMcollabGUI(ctk.CTk):
                 self.log(
                     f"Warnung: {os.path.basename(filepath)} verwendet unsupported Schema. Versuche alternative Methode...")
                 try:
+                    # Compressed files are patched in memory instead of via a temporary file
+                    if compressed_step:
+                        content = self.replace_ifc4x3_schema(decode_ifc_text(self.read_ifc_bytes(filepath)), filepath)
+                        ifc_file = ifcopenshell.file.from_string(content)
+                        self.log(f"Erfolg: {os.path.basename(filepath)} mit Schema-Fallback geöffnet")
+                        return ifc_file
+
                     import tempfile
                     import shutil
 
@@ -351,12 +1734,7 @@ class BIMcollabGUI(ctk.CTk):
                             content = original.read()
 
                         # Replace IFC4X3 schema references with IFC4
-                        if 'IFC4X3_RC4' in content:
-                            content = content.replace('IFC4X3_RC4', 'IFC4')
-                            self.log(f"Schema-Fallback: IFC4X3_RC4 -> IFC4 für {os.path.basename(filepath)}")
-                        elif 'IFC4X3' in content:
-                            content = content.replace('IFC4X3', 'IFC4')
-                            self.log(f"Schema-Fallback: IFC4X3 -> IFC4 für {os.path.basename(filepath)}")
+                        content = self.replace_ifc4x3_schema(content, filepath)
 
                         temp_file.write(content)
                         temp_file.flush()
@@ -378,29 +1756,66 @@ class BIMcollabGUI(ctk.CTk):
             else:
                 raise e
 
-    def get_compatible_entity_types(self, schema_info):
-        """Get list of compatible IFC entity types based on schema version"""
-        base_types = ["IfcObjectDefinition", "IfcBuildingElement", "IfcElement", "IfcObject", "IfcProduct"]
-
-        # Add IFC4X3 specific types
-        if schema_info['is_ifc4x3']:
-            additional_types = [
-                "IfcBuiltElement", "IfcElementAssembly", "IfcElementComponent",
-                "IfcInfrastructureElement", "IfcCivilElement", "IfcFacility"
-            ]
-            base_types.extend(additional_types)
-        # Add IFC4 specific types
-        elif schema_info['is_ifc4']:
-            additional_types = ["IfcElementAssembly", "IfcElementComponent"]
-            base_types.extend(additional_types)
-
-        return base_types
+    def replace_ifc4x3_schema(self, content, filepath):
+        """Replace IFC4X3 schema references with IFC4 (schema fallback)"""
+        if 'IFC4X3_RC4' in content:
+            content = content.replace('IFC4X3_RC4', 'IFC4')
+            self.log(f"Schema-Fallback: IFC4X3_RC4 -> IFC4 für {os.path.basename(filepath)}")
+        elif 'IFC4X3' in content:
+            content = content.replace('IFC4X3', 'IFC4')
+            self.log(f"Schema-Fallback: IFC4X3 -> IFC4 für {os.path.basename(filepath)}")
+        return content
+
+    def open_ifczip(self, filepath):
+        """Open an ifcZIP archive: small content is parsed from memory, large content from a temporary file"""
+        import ifcopenshell
+
+        start = time.perf_counter()
+        compressed_mb = os.path.getsize(filepath) / 1e6
+        uncompressed_mb = ifc_member_size(filepath) / 1e6
+        peak_before = peak_memory_mb()
+        if uncompressed_mb * 1e6 > IFCZIP_MEMORY_LIMIT:
+            # from_string copies the text into the parser, so memory would hold the content
+            # at least twice; streaming to a temporary file keeps only the parsed model
+            import shutil
+            import tempfile
+
+            temp_file = tempfile.NamedTemporaryFile(suffix=".ifc", delete=False)
+            try:
+                with temp_file, open_ifc_stream(filepath) as stream:
+                    shutil.copyfileobj(stream, temp_file, 1 << 20)
+                decompress_time = time.perf_counter() - start
+                ifc_file = ifcopenshell.open(temp_file.name)
+            finally:
+                os.unlink(temp_file.name)
+            disk = f"temporäre Datei: {uncompressed_mb:.1f} MB"
+        else:
+            data = self.read_ifc_bytes(filepath)
+            decompress_time = time.perf_counter() - start
+            # Bytes, decoded text and the parser's own copy of it (from_string) briefly coexist
+            text = decode_ifc_text(data)
+            del data
+            ifc_file = ifcopenshell.file.from_string(text)
+            del text
+            disk = "zusätzlicher Speicherplatz auf Disk: 0 MB"
+
+        # Report throughput, disk use and the growth of the peak memory while opening
+        throughput = uncompressed_mb / decompress_time if decompress_time > 0 else float("inf")
+        peak = peak_memory_mb()
+        memory = ""
+        if peak is not None:
+            memory = f", Spitzen-Speicherbedarf: {peak:.0f} MB (+{peak - peak_before:.0f} MB beim Öffnen)"
+        self.log(
+            f"{os.path.basename(filepath)}: {compressed_mb:.1f} MB -> {uncompressed_mb:.1f} MB entpackt in "
+            f"{decompress_time:.2f} s ({throughput:.0f} MB/s), {disk}{memory}"
+        )
+        return ifc_file
 
     def add_files(self):
         """Open file dialog and add selected IFC files"""
         files = filedialog.askopenfilenames(
             title="IFC-Dateien auswählen",
-            filetypes=[("IFC Files", "*.ifc")]
+            filetypes=[("IFC Files", "*.ifc *.ifczip"), ("IFC", "*.ifc"), ("ifcZIP", "*.ifczip")]
         )
         if files:
             for file in files:
@@ -413,18 +1828,14 @@ class BIMcollabGUI(ctk.CTk):
                         ifc = self.open_ifc_file_safely(file)
                         schema_info = self.detect_ifc_schema(ifc)
                         self.ifc_schemas[file] = schema_info
-                        schema_text = f" ({schema_info['schema']})"
-                        self.ifc_schemas[file] = self.detect_ifc_schema(ifc)
+                        self.ifc_projects[file] = sorted(p.GlobalId for p in ifc.by_type("IfcProject"))
                         self.log(f"IFC-Datei geladen: {filename} - Schema: {schema_info['schema']}")
                         # Extract properties from the IFC file
                         self.add_properties_from_ifc(ifc, file)
                     except Exception as e:
                         self.log(f"Fehler beim Laden von {filename}: {e}")
-                # Update file listbox
-                self.file_listbox.configure(state="normal")
-                self.file_listbox.delete("1.0", "end")
-                self.file_listbox.insert("end", os.path.basename(file) + schema_text)
-                self.file_listbox.configure(state="disabled")
+            # Update file listbox
+            self.update_file_listbox()
 
     def update_properties(self):
         """Update property checkboxes based on selected PropertySets"""
@@ -454,6 +1865,7 @@ class BIMcollabGUI(ctk.CTk):
                     self.bauphase_frame, 
                     text=prop, 
                     variable=var,
+                    command=self.update_preview,
                     font=main_font,
                     corner_radius=STYLING["corner-radius"],
                     fg_color=COLORS["B+S"]["fg"],
@@ -471,6 +1883,7 @@ class BIMcollabGUI(ctk.CTk):
                     self.rueckbauphase_frame, 
                     text=prop, 
                     variable=var,
+                    command=self.update_preview,
                     font=main_font,
                     corner_radius=STYLING["corner-radius"],
                     fg_color=COLORS["B+S"]["fg"],
@@ -485,46 +1898,55 @@ class BIMcollabGUI(ctk.CTk):
     def add_properties_from_ifc(self, ifc, file):
             """Extract PropertySets and properties from IFC file"""
             schema_info = self.detect_ifc_schema(ifc)
-            compatible_types = self.get_compatible_entity_types(schema_info)
             self.log(f"Lade Metadaten aus {os.path.basename(file)} (Schema: {schema_info['schema']})")
 
             try:
+                # Numeric values per (pset, property) name and raw value: bounded by the distinct
+                # values, not by the number of property instances
+                numbers_cache = {}
+
                 def add_pset(pset_obj):
                     """Helper function to add PropertySet and its properties"""
                     if pset_obj and pset_obj.is_a('IfcPropertySet'):
                         pset_name = getattr(pset_obj, 'Name', None)
                         if pset_name:
-                            self.pset_properties.setdefault(pset_name, set())
+                            properties = self.pset_properties.setdefault(pset_name, {})
                             for prop in (getattr(pset_obj, "HasProperties", []) or []):
                                 if hasattr(prop, "Name") and prop.Name:
-                                    self.pset_properties[pset_name].add(prop.Name)
-                
-                
-                
+                                    # Preview index: elements carrying the property and their numeric values
+                                    stats = properties.get(prop.Name)
+                                    if stats is None:
+                                        stats = properties[prop.Name] = PropertyStats()
+                                    cache = numbers_cache.setdefault((pset_name, prop.Name), {})
+                                    raw = self._property_raw_value(prop)
+                                    numbers = cache.get(raw)
+                                    if numbers is None:
+                                        numbers = self._property_numbers(prop)
+                                        if raw is not None:
+                                            cache[raw] = numbers
+                                    stats.elements += 1
+                                    if numbers:
+                                        stats.numeric += 1
+                                        stats.values.update(numbers)
+
                 processed_entities = 0
-                # Process all compatible entity types
-                for entity_type in compatible_types:
-                    try:
-                        entities = ifc.by_type(entity_type)
-                        for obj in entities:
-                            processed_entities += 1
-                            # Check entity's property definitions
-                            if hasattr(obj, 'IsDefinedBy') and obj.IsDefinedBy:
-                                for rel in obj.IsDefinedBy:
-                                    if not rel:
-                                        continue
-                                    # Handle direct property definitions
-                                    if rel.is_a('IfcRelDefinesByProperties'):
-                                        add_pset(rel.RelatingPropertyDefinition)
-                                    # Handle type property definitions
-                                    elif rel.is_a('IfcRelDefinesByType'):
-                                        rtype = getattr(rel, "RelatingType", None)
-                                        if rtype is not None:
-                                            for pset in getattr(rtype, "HasPropertySets", []) or []:
-                                                add_pset(pset)
-                    except Exception as e:
-                        self.log(f"Warnung: Konnte {entity_type} nicht verarbeiten: {e}")
-                        continue
+                # IfcObjectDefinition covers all object and type entities of every schema, each once
+                for obj in ifc.by_type("IfcObjectDefinition"):
+                    processed_entities += 1
+                    # Check entity's property definitions
+                    if hasattr(obj, 'IsDefinedBy') and obj.IsDefinedBy:
+                        for rel in obj.IsDefinedBy:
+                            if not rel:
+                                continue
+                            # Handle direct property definitions
+                            if rel.is_a('IfcRelDefinesByProperties'):
+                                add_pset(rel.RelatingPropertyDefinition)
+                            # Handle type property definitions
+                            elif rel.is_a('IfcRelDefinesByType'):
+                                rtype = getattr(rel, "RelatingType", None)
+                                if rtype is not None:
+                                    for pset in getattr(rtype, "HasPropertySets", []) or []:
+                                        add_pset(pset)
                 
                 self.log(f"Verarbeitet: {processed_entities} Entities, gefunden: {len(self.pset_properties)} PropertySets")
                 self.update_property_checkboxes()
@@ -536,16 +1958,17 @@ class BIMcollabGUI(ctk.CTk):
         self.file_listbox.configure(state="normal")
         self.file_listbox.delete("1.0", "end")
         for file in self.selected_files:
-            ifc = self.open_ifc_file_safely(file)
-            schema_info = self.detect_ifc_schema(ifc)
-            schema_text = f" ({schema_info['schema']})"
-            self.file_listbox.insert("end", os.path.basename(file) + schema_text)
+            # Use the detected schema, otherwise only sniff the (decompressed) header
+            schema = self.ifc_schemas.get(file, {}).get('schema') or sniff_ifc_schema(file) or 'UNKNOWN'
+            schema_text = f" ({schema})"
+            self.file_listbox.insert("end", os.path.basename(file) + schema_text + "\n")
         self.file_listbox.configure(state="disabled")
 
     def clear_files(self):
         """Clear all selected files and reset GUI"""
         self.selected_files.clear()
         self.ifc_schemas = {}
+        self.ifc_projects = {}
         self.update_file_listbox()
         # Clear all property checkboxes
         for widget in self.pset_frame.winfo_children():
@@ -558,11 +1981,15 @@ class BIMcollabGUI(ctk.CTk):
         self.bauphase_vars.clear()
         self.rueckbauphase_vars.clear()
         self.pset_properties = {}
+        self.update_preview()
         self.log("Dateiliste gelöscht")
 
     def browse_output(self):
         """Open save file dialog for output path"""
-        f = filedialog.asksaveasfilename(defaultextension=".bcsv", filetypes=[("BCSV", "*.bcsv")])
+        f = filedialog.asksaveasfilename(
+            defaultextension=".bcsv",
+            filetypes=[(label, f"*{extension}") for label, extension, _ in SMARTVIEW_FORMATS.values()]
+        )
         if f:
             self.output_path.set(f)
 
@@ -628,8 +2055,35 @@ class BIMcollabGUI(ctk.CTk):
                         if pset and pset.is_a('IfcPropertySet'):
                             yield pset
 
-    def get_phases_from_ifc(self, entity, psets, props):
-        """Extract phase numbers from IFC entity properties"""
+    def _property_value(self, prop):
+        """Value of a single or enumerated value property with its IFC type (bool, int, float or str)"""
+        if prop.is_a("IfcPropertySingleValue"):
+            value = prop.NominalValue
+        elif prop.is_a("IfcPropertyEnumeratedValue"):
+            value = (prop.EnumerationValues or (None,))[0]
+        else:
+            return None
+        return getattr(value, "wrappedValue", None)
+
+    def _property_raw_value(self, prop):
+        """Hashable raw value of a property (IFC type and value of each entry), None if unknown"""
+        if prop.is_a("IfcPropertySingleValue"):
+            values = (prop.NominalValue,)
+        elif prop.is_a("IfcPropertyEnumeratedValue"):
+            values = prop.EnumerationValues or ()
+        elif prop.is_a("IfcPropertyListValue"):
+            values = prop.ListValues or ()
+        else:
+            return None
+        raw = tuple((v.is_a(), v.wrappedValue) if v is not None else None for v in values)
+        try:
+            hash(raw)
+        except TypeError:
+            return None
+        return raw
+
+    def _property_numbers(self, prop):
+        """Numeric values of a single, enumerated or list value property"""
         def to_float_maybe(val):
             """Try to convert property value to float"""
             if val is None:
@@ -653,6 +2107,25 @@ class BIMcollabGUI(ctk.CTk):
                     return None
             return None
 
+        # Handle single value properties
+        if prop.is_a("IfcPropertySingleValue"):
+            num = to_float_maybe(getattr(prop, "NominalValue", None))
+            return [num] if num is not None else []
+
+        # Handle enumerated value properties
+        if prop.is_a("IfcPropertyEnumeratedValue"):
+            ev = getattr(prop, "EnumerationValues", []) or []
+            num = to_float_maybe(ev[0]) if ev else None
+            return [num] if num is not None else []
+
+        # Handle list value properties
+        if prop.is_a("IfcPropertyListValue"):
+            lv = getattr(prop, "ListValues", []) or []
+            return [num for num in (to_float_maybe(v) for v in lv) if num is not None]
+        return []
+
+    def get_phases_from_ifc(self, entity, psets, props):
+        """Extract phase numbers from IFC entity properties"""
         phases = []
         # Iterate through entity's PropertySets
         for pset in self._iter_property_sets(entity):
@@ -665,32 +2138,92 @@ class BIMcollabGUI(ctk.CTk):
                 name = getattr(prop, "Name", None)
                 if props and name not in props:
                     continue
+                phases.extend(self._property_numbers(prop))
 
-                # Handle single value properties
-                if prop.is_a("IfcPropertySingleValue"):
-                    num = to_float_maybe(getattr(prop, "NominalValue", None))
-                    if num is not None:
-                        phases.append(num)
-                        continue
+        return phases
+
+    def collect_phase_values(self, pairs):
+        """Extract the values of all (pset, property) pairs from all selected files in one traversal"""
+        values = {pair: PhaseCollector() for pair in pairs}
+        psets = {pset for pset, _ in pairs}
+        for file in self.selected_files:
+            if not file.lower().endswith(IFC_EXTENSIONS):
+                continue
+            if self.parallel_scan.get() and file.lower().endswith(".ifc"):
+                try:
+                    self.collect_phase_values_parallel(file, values)
+                    continue
+                except (OSError, RuntimeError, MemoryError) as e:
+                    # Worker processes unavailable or broken (BrokenProcessPool is a RuntimeError):
+                    # fall back to the traversal; scan errors themselves are not hidden
+                    self.log(f"Paralleles Einlesen fehlgeschlagen für {os.path.basename(file)} "
+                             f"({type(e).__name__}: {e}), verwende sequentielles Einlesen")
+            try:
+                # Open IFC file
+                ifc = self.open_ifc_file_safely(file)
+                schema_info = self.ifc_schemas.get(file, self.detect_ifc_schema(ifc))
+
+                self.log(f"Verarbeite {os.path.basename(file)} mit Schema {schema_info['schema']}")
 
-                # Handle enumerated value properties
-                if prop.is_a("IfcPropertyEnumeratedValue"):
-                    ev = getattr(prop, "EnumerationValues", []) or []
-                    if ev:
-                        num = to_float_maybe(ev[0])
-                        if num is not None:
-                            phases.append(num)
+                # IfcObjectDefinition covers all object and type entities of every schema, each once
+                for obj in ifc.by_type("IfcObjectDefinition"):
+                    for pset in self._iter_property_sets(obj):
+                        pset_name = getattr(pset, 'Name', None)
+                        if pset_name not in psets:
                             continue
+                        for prop in getattr(pset, "HasProperties", []) or []:
+                            target = values.get((pset_name, getattr(prop, "Name", None)))
+                            if target is not None:
+                                target.update(self._property_numbers(prop))
 
-                # Handle list value properties
-                if prop.is_a("IfcPropertyListValue"):
-                    lv = getattr(prop, "ListValues", []) or []
-                    for v in lv:
-                        num = to_float_maybe(v)
-                        if num is not None:
-                            phases.append(num)
+            except Exception as e:
+                self.log(f"Fehler beim Lesen {os.path.basename(file)}: {e}")
+        return values
+
+    def collect_phase_values_parallel(self, file, values):
+        """Add the values of one IFC-SPF file, scanned in byte-range chunks on all cores"""
+        type_names = ()
+        if (sniff_ifc_schema(file) or "").startswith("IFC2X3"):
+            # In IFC2x3 IsDefinedBy also contains IfcRelDefinesByType, so type property sets count
+            type_names = ifc_subtype_names("IFC2X3", "IfcTypeObject")
+
+        start = time.perf_counter()
+        file_values, records, chunks = scan_phase_values(file, list(values), type_names=type_names)
+        elapsed = time.perf_counter() - start
+        for pair, found in file_values.items():
+            values[pair].update(found)
+
+        size_mb = os.path.getsize(file) / 1e6
+        throughput = size_mb / elapsed if elapsed > 0 else float("inf")
+        self.log(
+            f"Paralleles Einlesen {os.path.basename(file)}: {size_mb:.1f} MB, {records} Records in {chunks} Blöcken "
+            f"auf {os.cpu_count() or 1} Prozessorkernen in {elapsed:.2f} s ({throughput:.0f} MB/s)"
+        )
 
-        return phases
+    def get_property_selection(self):
+        """Return (psets, props_bau, props_rueck) of the current selection or None if incomplete"""
+        if self.use_standard_attribution.get():
+            # Use standard Swiss engineering PropertySet
+            return ["CH_Ing_Uebergeordnet"], ["Bauphase"], ["Rueckbauphase"]
+
+        # Use custom selection
+        psets = [p for p, v in self.pset_vars.items() if v.get()]
+        props_bau = [p for p, v in self.bauphase_vars.items() if v.get()]
+        props_rueck = [p for p, v in self.rueckbauphase_vars.items() if v.get()]
+        if not psets or not props_bau or not props_rueck:
+            messagebox.showerror("Fehler", "Bitte PropertySets und Properties für Bau- UND Rückbauphase wählen")
+            return None
+        return psets, props_bau, props_rueck
+
+    def phase_title(self, phase, index, count):
+        """Display title of a phase ("Bestand", phase number or "Endzustand")"""
+        return "Bestand" if phase == 0 else ("Endzustand" if index == count - 1 else phase)
+
+    def log_peak_memory(self):
+        """Log the peak memory of the process after collecting the phases"""
+        peak = peak_memory_mb()
+        if peak is not None:
+            self.log(f"Spitzen-Speicherbedarf: {peak:.0f} MB")
 
     def process_files(self):
         """Main processing function: extract phases and generate smartview"""
@@ -702,202 +2235,660 @@ class BIMcollabGUI(ctk.CTk):
             messagebox.showerror("Fehler", "Kein Output-Pfad")
             return
 
-        # Determine which PropertySets and properties to use
-        if self.use_standard_attribution.get():
-            # Use standard Swiss engineering PropertySet
-            psets = ["CH_Ing_Uebergeordnet"]
-            props_bau = ["Bauphase"]
-            props_rueck = ["Rueckbauphase"]
-        else:
-            # Use custom selection
-            psets = [p for p, v in self.pset_vars.items() if v.get()]
-            props_bau = [p for p, v in self.bauphase_vars.items() if v.get()]
-            props_rueck = [p for p, v in self.rueckbauphase_vars.items() if v.get()]
-            if not psets or not props_bau or not props_rueck:
-                messagebox.showerror("Fehler", "Bitte PropertySets und Properties für Bau- UND Rückbauphase wählen")
-                return
+        # Phases from the construction schedule instead of element properties
+        if self.phase_source.get() == PHASE_SOURCES[1]:
+            self.process_task_schedule()
+            return
 
-        # Extract phases from all files
-        phases = []
-        for file in self.selected_files:
-            if file.endswith(".ifc"):
-                try:
-                    # Open IFC file
-                    ifc = self.open_ifc_file_safely(file)
-                    schema_info = self.ifc_schemas.get(file, self.detect_ifc_schema(ifc))
-                    compatible_types = self.get_compatible_entity_types(schema_info)
+        # Determine which PropertySets and properties to use
+        selection = self.get_property_selection()
+        if selection is None:
+            return
+        psets, props_bau, props_rueck = selection
 
-                    self.log(f"Verarbeite {os.path.basename(file)} mit Schema {schema_info['schema']}")
+        # Partition phases by zone if requested
+        if ZONE_MODES.get(self.zone_mode.get()) is not None:
+            self.process_zones(psets, props_bau, props_rueck, self.zone_mode.get())
+            return
 
-                    # Process all compatible entity types
-                    for entity_type in compatible_types:
-                        try:
-                            entities = ifc.by_type(entity_type)
-                            for obj in entities:
-                                # Extract phases from entity
-                                phases.extend(
-                                    self.get_phases_from_ifc(obj, psets, props_bau + props_rueck)
-                                )
-                        except Exception as e:
-                            self.log(
-                                f"Warnung: Konnte {entity_type} in {os.path.basename(file)} nicht verarbeiten: {e}")
-                            continue
+        bauphase_props = [(pset, p) for pset in psets for p in props_bau]
+        rueckbau_props = [(pset, p) for pset in psets for p in props_rueck]
 
-                except Exception as e:
-                    self.log(f"Fehler beim Lesen {os.path.basename(file)}: {e}")
+        # Extract phases from all files
+        values = self.collect_phase_values(bauphase_props + rueckbau_props)
+        phases = PhaseCollector()
+        for collector in values.values():
+            phases.update(collector)
+        self.log_peak_memory()
 
         # Check if any phases were found
         if not phases:
             messagebox.showerror("Fehler", "Keine Phasen gefunden")
             return
 
-        # Sort and deduplicate phases
-        phases = sorted(set(phases))
-        # Add final phase (one more than the last)
-        if len(phases) >= 2:
-            phases.append(phases[-1] + 1)
+        # Sort and deduplicate phases, add final phase
+        phases = finalize_phases(phases)
 
         self.log(f"Gefundene Phasen: {phases}")
 
         # Generate smartview XML file
-        self.generate_smartview(
-            phases,
-            bauphase_props=[(pset, p) for pset in psets for p in props_bau],
-            rueckbau_props=[(pset, p) for pset in psets for p in props_rueck]
+        output_path = self.output_path.get()
+        if not self.write_smartview_output(phases, bauphase_props, rueckbau_props, output_path):
+            messagebox.showinfo("Unverändert", f"Datei ist aktuell:\n{output_path}")
+            return
+        self.log(
+            f"Fertig! Es wurden folgende Phasen verarbeitet: {', '.join(str(x) for x in phases)}\n\n"
+            f"Der Output wurde unter folgendem Pfad gespeichert:\n{output_path}"
         )
+        messagebox.showinfo("Erfolg", f"Datei gespeichert:\n{output_path}")
+
+    def build_zone_index(self, ifc, zone_mode, grouping=None):
+        """Build {element id: zone} once, so each element's zone is a dictionary lookup.
+
+        Spatial modes walk IfcRelContainedInSpatialStructure/IfcRelAggregates upwards to the
+        nearest spatial element of the zone type; results are memoised per visited entity.
+        """
+        index = {}
+        if zone_mode == "Eigenschaft":
+            # Zone is the value of a grouping property
+            pset_name, prop_name = grouping
+            for obj in ifc.by_type("IfcElement"):
+                for pset in self._iter_property_sets(obj):
+                    if getattr(pset, 'Name', None) != pset_name:
+                        continue
+                    for prop in getattr(pset, "HasProperties", []) or []:
+                        if getattr(prop, "Name", None) != prop_name:
+                            continue
+                        value = self._property_value(prop)
+                        if value is not None:
+                            index[obj.id()] = value
+            return index
+
+        zone_types = ZONE_MODES[zone_mode][0]
+        # Parent of every object: spatial container first, then aggregation (assemblies, spatial structure)
+        parent = {}
+        for rel in ifc.by_type("IfcRelContainedInSpatialStructure"):
+            for obj in rel.RelatedElements or []:
+                parent[obj.id()] = rel.RelatingStructure
+        for rel in ifc.by_type("IfcRelAggregates"):
+            for obj in rel.RelatedObjects or []:
+                parent.setdefault(obj.id(), rel.RelatingObject)
+
+        zone_of = {}
+        for obj in ifc.by_type("IfcElement"):
+            path = []
+            current = obj
+            zone = None
+            while current is not None:
+                cid = current.id()
+                if cid in zone_of:
+                    zone = zone_of[cid]
+                    break
+                if any(current.is_a(t) for t in zone_types):
+                    zone = getattr(current, 'Name', None) or getattr(current, 'LongName', None) or current.GlobalId
+                    zone_of[cid] = zone
+                    break
+                if cid in path:
+                    break
+                path.append(cid)
+                current = parent.get(cid)
+            for cid in path:
+                zone_of[cid] = zone
+            if zone is not None:
+                index[obj.id()] = zone
+        return index
+
+    def process_zones(self, psets, props_bau, props_rueck, zone_mode):
+        """Generate one smartview set per zone with the phases occurring in that zone"""
+        grouping = None
+        if zone_mode == "Eigenschaft":
+            text = self.zone_grouping.get().strip()
+            if "." not in text:
+                messagebox.showerror("Fehler", "Bitte Gruppierungs-Property als PropertySet.Property angeben")
+                return
+            grouping = tuple(text.split(".", 1))
+            # Value type follows the property values (see ZOOM_VALUE_TYPES)
+            zone_property = (grouping[1], grouping[0], "PropertySet", None)
+        else:
+            zone_property = ZONE_MODES[zone_mode][1]
+
+        # Phase values per zone
+        zone_values = {}
+        unassigned = 0
+        for file in self.selected_files:
+            try:
+                ifc = self.open_ifc_file_safely(file)
+                start = time.perf_counter()
+                zone_index = self.build_zone_index(ifc, zone_mode, grouping)
+                self.log(f"Zonen-Index {os.path.basename(file)}: {len(zone_index)} Elemente, "
+                         f"{len({(type(z), z) for z in zone_index.values()})} Zonen in "
+                         f"{time.perf_counter() - start:.2f} s")
+                for eid, (bau, rueck) in self.collect_element_phases(ifc, psets, props_bau, props_rueck).items():
+                    zone = zone_index.get(eid)
+                    if zone is None:
+                        unassigned += 1
+                        continue
+                    # Keyed by type as well: 0, False and 0.0 are equal dictionary keys but different zones
+                    zone_values.setdefault((type(zone), zone), PhaseCollector()).update(
+                        v for v in (bau, rueck) if v is not None)
+            except Exception as e:
+                self.log(f"Fehler beim Lesen {os.path.basename(file)}: {e}")
+        if unassigned:
+            self.log(f"Warnung: {unassigned} Elemente mit Phasen ohne Zone ({zone_mode}) werden in allen Zonen ausgeblendet")
+        self.log_peak_memory()
+
+        # Only zone x phase combinations that actually occur
+        # Property zones keep their value type, so numbers and texts are sorted separately
+        zones = [
+            (zone, finalize_phases(values))
+            for (_, zone), values in sorted(
+                zone_values.items(), key=lambda item: (isinstance(item[0][1], str), item[0][1], item[0][0].__name__))
+            if values
+        ]
+        if not zones:
+            messagebox.showerror("Fehler", "Keine Phasen gefunden")
+            return
+        for zone, phases in zones:
+            self.log(f"Zone {zone}: Phasen {', '.join(str(x) for x in phases)}")
+
+        output_path = self.output_path.get()
+        if not self.write_smartview_output(
+            None,
+            [(pset, p) for pset in psets for p in props_bau],
+            [(pset, p) for pset in psets for p in props_rueck],
+            output_path,
+            zones=zones,
+            zone_property=zone_property
+        ):
+            messagebox.showinfo("Unverändert", f"Datei ist aktuell:\n{output_path}")
+            return
+        self.log(f"Fertig! {len(zones)} Smartview-Sets ({zone_mode}) unter folgendem Pfad gespeichert:\n{output_path}")
+        messagebox.showinfo("Erfolg", f"Datei gespeichert:\n{output_path}")
+
+    def schedule_tasks(self, ifc):
+        """{task id: [role (0 = build, 1 = demolish), start date or None]} of all construction tasks"""
+        tasks = {}
+        for task in ifc.by_type("IfcTask"):
+            if hasattr(task, "PredefinedType"):
+                kind = task.PredefinedType
+            else:
+                # IFC2x3 has no task type, ObjectType may name a demolition
+                kind = (task.ObjectType or "").upper()
+                kind = kind if kind in TASK_DEMOLISH_TYPES else None
+            if kind in TASK_DEMOLISH_TYPES:
+                role = 1
+            elif kind in TASK_BUILD_TYPES:
+                role = 0
+            else:
+                continue
+            task_time = getattr(task, "TaskTime", None)
+            start = None
+            if task_time is not None:
+                start = task_time.ScheduleStart or task_time.ActualStart or task_time.EarlyStart
+            tasks[task.id()] = [role, ifc_schedule_date(start)]
+        if ifc.schema == "IFC2X3":
+            for rel in ifc.by_type("IfcRelAssignsTasks"):
+                control = rel.TimeForTask
+                if control is None:
+                    continue
+                start = ifc_schedule_date(control.ScheduleStart or control.ActualStart or control.EarlyStart)
+                for task in rel.RelatedObjects or []:
+                    if task.id() in tasks and start:
+                        tasks[task.id()][1] = start
+        return tasks
+
+    def schedule_dates(self, models):
+        """Ranked start dates of the tasks of several models, so their phases share one time line"""
+        return rank_schedule_dates(
+            start for ifc in models for _, start in self.schedule_tasks(ifc).values() if start)
+
+    def build_task_phase_index(self, ifc, date_rank=None):
+        """Build {element id: (Bauphase, Rueckbauphase)} from the construction schedule.
+
+        Tasks are ranked by their start date (IfcTaskTime, in IFC2x3 IfcScheduleTimeControl) or,
+        if no task has a date, by their depth in IfcRelSequence. date_rank (see schedule_dates)
+        ranks the dates of all selected models together; by default only this model's dates are
+        ranked. Every relationship is visited once, so the index needs no per-element lookups.
+        """
+        tasks = self.schedule_tasks(ifc)
+
+        # Phase of each task: rank of its start date, otherwise its depth in the task sequence
+        starts = [start for _, start in tasks.values() if start]
+        if starts:
+            rank = date_rank if date_rank is not None else rank_schedule_dates(starts)
+            task_phase = {tid: rank[start] for tid, (_, start) in tasks.items() if start}
+        else:
+            successors = {}
+            waiting = dict.fromkeys(tasks, 0)
+            for rel in ifc.by_type("IfcRelSequence"):
+                before, after = rel.RelatingProcess.id(), rel.RelatedProcess.id()
+                if before in tasks and after in tasks:
+                    successors.setdefault(before, []).append(after)
+                    waiting[after] += 1
+            task_phase = {tid: 1.0 for tid, count in waiting.items() if count == 0}
+            pending = list(task_phase)
+            while pending:
+                tid = pending.pop()
+                for after in successors.get(tid, ()):
+                    task_phase[after] = max(task_phase.get(after, 1.0), task_phase[tid] + 1)
+                    waiting[after] -= 1
+                    if waiting[after] == 0:
+                        pending.append(after)
+        if len(task_phase) < len(tasks):
+            self.log(f"Warnung: {len(tasks) - len(task_phase)} Vorgänge ohne Termin bzw. Reihenfolge ignoriert")
+
+        # Earliest build and demolition task of every assigned product
+        phases = {}
+        for rel in ifc.by_type("IfcRelAssignsToProcess"):
+            process = rel.RelatingProcess
+            phase = task_phase.get(process.id()) if process is not None else None
+            if phase is None:
+                continue
+            role = tasks[process.id()][0]
+            for obj in rel.RelatedObjects or []:
+                if not obj.is_a("IfcProduct"):
+                    continue
+                element = phases.setdefault(obj.id(), [None, None])
+                if element[role] is None or phase < element[role]:
+                    element[role] = phase
+
+        # Elements that are only demolished belong to the existing condition
+        element_phases = ElementPhases()
+        for eid, (bau, rueck) in phases.items():
+            element_phases.add(eid, 0.0 if bau is None else bau, rueck)
+        return element_phases
+
+    def write_task_phase_model(self, file, ifc, element_phases, path):
+        """Copy a model and attach the schedule-derived phases as property sets (one per phase pair)"""
+        import ifcopenshell.guid
+
+        data = self.read_ifc_bytes(file)
+        next_id = max((int(m.group(1)) for m in STEP_RECORD.finditer(data)), default=0) + 1
+        owner_histories = ifc.by_type("IfcOwnerHistory")
+        owner = f"#{owner_histories[0].id()}" if owner_histories else "$"
+        pset_name, bau_name, rueck_name = TASK_PHASE_PSET
+
+        # Elements with the same phases share one property set
+        groups = {}
+        for eid, phases in element_phases.items():
+            groups.setdefault(phases, []).append(eid)
+        records = []
+        for (bau, rueck), eids in sorted(groups.items(), key=lambda g: (g[0][0], g[0][1] or 0.0)):
+            bau_id, rueck_id, pset_id, rel_id = range(next_id, next_id + 4)
+            next_id += 4
+            pset_guid, rel_guid = (
+                ifcopenshell.guid.compress(deterministic_guid(os.path.basename(file), part, bau, rueck).hex)
+                for part in ("pset", "rel")
+            )
+            related = ",".join(f"#{eid}" for eid in sorted(eids))
+            records.append(f"#{bau_id}=IFCPROPERTYSINGLEVALUE('{bau_name}',$,IFCREAL({float(bau)!r}),$);")
+            records.append(f"#{rueck_id}=IFCPROPERTYSINGLEVALUE('{rueck_name}',$,IFCREAL({float(rueck or 0)!r}),$);")
+            records.append(f"#{pset_id}=IFCPROPERTYSET('{pset_guid}',{owner},'{pset_name}',$,(#{bau_id},#{rueck_id}));")
+            records.append(f"#{rel_id}=IFCRELDEFINESBYPROPERTIES('{rel_guid}',{owner},$,$,({related}),#{pset_id});")
+        append_step_records(data, path, records)
+
+    def process_task_schedule(self):
+        """Generate the smartview from the construction schedule and write models carrying the derived phases"""
+        output_path = self.output_path.get()
+        values = PhaseCollector()
+        models = []
+        for file in self.selected_files:
+            try:
+                models.append((file, self.open_ifc_file_safely(file)))
+            except Exception as e:
+                self.log(f"Fehler beim Lesen {os.path.basename(file)}: {e}")
+        # Dates are ranked across all models, so equal phase numbers mean the same date
+        date_rank = self.schedule_dates(ifc for _, ifc in models)
+        for file, ifc in models:
+            filename = os.path.basename(file)
+            try:
+                start = time.perf_counter()
+                element_phases = self.build_task_phase_index(ifc, date_rank)
+                self.log(f"Terminplan {filename}: {len(element_phases)} Elemente mit Phasen, "
+                         f"{time.perf_counter() - start:.2f} s")
+                if not element_phases:
+                    continue
+                values.update(element_phases.phase_values())
+
+                # ZOOM rules read properties, so the phases are attached to a copy of the model
+                stem = os.path.splitext(filename)[0]
+                path = os.path.join(os.path.dirname(os.path.abspath(output_path)), f"{stem}_Bauphasen.ifc")
+                self.write_task_phase_model(file, ifc, element_phases, path)
+                self.log(f"Modell mit Bauphasen gespeichert: {path}")
+            except Exception as e:
+                self.log(f"Fehler beim Lesen {filename}: {e}")
+        self.log_peak_memory()
+
+        if not values:
+            messagebox.showerror("Fehler", "Keine Phasen gefunden")
+            return
+        phases = finalize_phases(values)
+        self.log(f"Gefundene Phasen: {phases}")
+
+        pset_name, bau_name, rueck_name = TASK_PHASE_PSET
+        if not self.write_smartview_output(phases, [(pset_name, bau_name)], [(pset_name, rueck_name)], output_path):
+            messagebox.showinfo("Unverändert", f"Datei ist aktuell:\n{output_path}")
+            return
         self.log(
             f"Fertig! Es wurden folgende Phasen verarbeitet: {', '.join(str(x) for x in phases)}\n\n"
-            f"Der Output wurde unter folgendem Pfad gespeichert:\n{self.output_path.get()}"
+            f"Der Output wurde unter folgendem Pfad gespeichert:\n{output_path}"
         )
-        messagebox.showinfo("Erfolg", f"Datei gespeichert:\n{self.output_path.get()}")
+        messagebox.showinfo("Erfolg", f"Datei gespeichert:\n{output_path}")
 
-    def generate_smartview(self, phases, bauphase_props, rueckbau_props):
-        """Generate BIMcollab ZOOM smartview XML file"""
-        def w(file, text, level=0):
-            """Write indented XML line"""
-            file.write(("    " * level) + text + "\n")
+    def run_profiles(self):
+        """Generate the smartview sets of all profiles in a config file from a single model scan"""
+        if not self.selected_files:
+            messagebox.showerror("Fehler", "Keine Dateien ausgewählt")
+            return
+        config_path = filedialog.askopenfilename(
+            title="Profil-Konfiguration auswählen",
+            filetypes=[("Profile", "*.json *.toml"), ("JSON", "*.json"), ("TOML", "*.toml")]
+        )
+        if not config_path:
+            return
+        try:
+            profiles = load_profiles(config_path)
+        except Exception as e:
+            messagebox.showerror("Fehler", f"Profile konnten nicht geladen werden:\n{e}")
+            return
+
+        # Union of all (pset, property) pairs, extracted in one traversal
+        pairs = {}
+        for profile in profiles:
+            profile["bauphase_props"] = [(pset, p) for pset in profile["psets"] for p in profile["bauphase"]]
+            profile["rueckbau_props"] = [(pset, p) for pset in profile["psets"] for p in profile["rueckbauphase"]]
+            for pair in profile["bauphase_props"] + profile["rueckbau_props"]:
+                pairs[pair] = None
+        self.log(f"{len(profiles)} Profile geladen, {len(pairs)} Properties werden in einem Durchlauf gelesen")
+        values = self.collect_phase_values(list(pairs))
+        self.log_peak_memory()
+
+        # Generate all outputs from the shared result
+        written = []
+        for profile in profiles:
+            profile_pairs = profile["bauphase_props"] + profile["rueckbau_props"]
+            phases = PhaseCollector()
+            for pair in dict.fromkeys(profile_pairs):
+                phases.update(values[pair])
+            if not phases:
+                self.log(f"Profil {profile['name']}: Keine Phasen gefunden")
+                continue
+            phases = finalize_phases(phases)
+            if self.write_smartview_output(phases, profile["bauphase_props"], profile["rueckbau_props"],
+                                           profile["output"], profile["title"], formats=profile["formats"]):
+                written.append(profile["output"])
+                self.log(f"Profil {profile['name']}: Phasen {', '.join(str(x) for x in phases)}\n{profile['output']}")
+
+        self.log(f"Fertig! {len(written)} von {len(profiles)} Profilen geschrieben")
+        messagebox.showinfo("Erfolg", f"{len(written)} von {len(profiles)} Profilen geschrieben")
+
+    def write_smartview_output(self, phases, bauphase_props, rueckbau_props, output_path, title=SMARTVIEWSET_TITLE,
+                               zones=None, zone_property=None, formats=None):
+        """Write the smartview files of all formats; returns False if deterministic mode found them unchanged"""
+        formats = formats or self.selected_formats()
+        deterministic = self.deterministic_output.get()
+        base, extension = os.path.splitext(output_path)
+        rules = None
+        if deterministic:
+            rules = [compile_phase_rules(phase, bauphase_props, rueckbau_props) for phase in phases]
+        pending = []
+        for key in formats:
+            path = output_path if extension.lower() == SMARTVIEW_FORMATS[key][1] else base + SMARTVIEW_FORMATS[key][1]
+            fingerprint = None
+            # Deterministic mode: skip writing if nothing relevant has changed
+            if deterministic:
+                fingerprint = content_fingerprint({
+                    "tool_version": TOOL_VERSION,
+                    "format": key,
+                    "writer": SMARTVIEW_FORMATS[key][2].__name__,
+                    "writer_parameters": repr(SMARTVIEW_PARAMETERS[key]),
+                    "rules": rules,
+                    "project": self.project_key(),
+                    "title": title,
+                    "phases": phases,
+                    "bauphase_props": bauphase_props,
+                    "rueckbau_props": rueckbau_props,
+                    "zones": zones,
+                    "zone_property": zone_property,
+                    "creator": getpass.getuser()
+                })
+                if is_output_current(path, fingerprint):
+                    self.log(f"Keine relevanten Änderungen, Schreiben übersprungen:\n{path}")
+                    continue
+            pending.append((key, path, fingerprint))
+        if not pending:
+            return False
+
+        # One rule compilation, then one cheap serialization per format
+        ruleset = self.compile_smartviews(
+            phases,
+            bauphase_props=bauphase_props,
+            rueckbau_props=rueckbau_props,
+            deterministic=deterministic,
+            title=title,
+            zones=zones,
+            zone_property=zone_property
+        )
+        for key, path, fingerprint in pending:
+            label, _, writer = SMARTVIEW_FORMATS[key]
+            with open(path, 'w', encoding="utf-8") as f:
+                writer(ruleset, f)
+            if fingerprint is not None:
+                write_fingerprint(path, fingerprint)
+            else:
+                remove_fingerprint(path)
+            if len(formats) > 1:
+                self.log(f"{label}: {path}")
+        return True
+
+    def selected_formats(self):
+        """Keys of the output formats selected in the GUI (BCSV if none is selected)"""
+        return [key for key, var in self.output_formats.items() if var.get()] or ["bcsv"]
+
+    def project_key(self):
+        """Stable key of the selected project (IfcProject GUIDs, else file names)"""
+        keys = set()
+        for file in self.selected_files:
+            keys.update(self.ifc_projects.get(file) or [os.path.basename(file)])
+        return ",".join(sorted(keys))
 
-        # Get current timestamp and username
-        now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    def compile_smartviews(self, phases, bauphase_props, rueckbau_props, deterministic=False,
+                           title=SMARTVIEWSET_TITLE, zones=None, zone_property=None):
+        """Compile the viewer-neutral smartview sets once per run (input of all backends)
+
+        zones: optional list of (zone, phases); one smartview set per zone is compiled and
+        elements outside the zone and elements without a zone are removed via zone_property
+        (name, pset, type, value type; None takes the value type from the zone value).
+        """
         username = getpass.getuser()
-        
-        # Generate XML file
-        with open(self.output_path.get(), 'w', encoding="utf-8") as f:
-            # XML header
-            w(f, '<?xml version="1.0"?>')
-            w(f, '<bimcollabsmartviewfile>')
-            w(f, '<version>6</version>', 1)
-            w(f, '<applicationversion>Win - Version: 9.2 (build 9.2.12.0)</applicationversion>', 1)
-            w(f, '</bimcollabsmartviewfile>')
-            w(f, '<SMARTVIEWSETS>')
-            w(f, '<SMARTVIEWSET>', 1)
-            w(f, '<TITLE>UC_Modellbasierte_Darstellung_Bauzustand</TITLE>', 2)
-            w(f, '<DESCRIPTION>UC_Modellbasierte_Darstellung_Bauzustand</DESCRIPTION>', 2)
-            w(f, f'<GUID>{uuid.uuid4()}</GUID>', 2)
-            w(f, f'<MODIFICATIONDATE>{now}</MODIFICATIONDATE>', 2)
-            w(f, '<SMARTVIEWS>', 2)
-
-            # Create smartview for each phase
-            for i, phase in enumerate(phases):
-                # Determine phase title
-                title = "Bestand" if phase == 0 else ("Endzustand" if i == len(phases) - 1 else phase)
-                sv_guid = uuid.uuid4()
-                
-                # Smartview header
-                w(f, '<SMARTVIEW>', 3)
-                w(f, f'<TITLE>Bauzustand Phase {title}</TITLE>', 4)
-                w(f, '<DESCRIPTION></DESCRIPTION>', 4)
-                w(f, f'<CREATOR>{username}</CREATOR>', 4)
-                w(f, f'<CREATIONDATE>{now}</CREATIONDATE>', 4)
-                w(f, f'<MODIFIER>{username}</MODIFIER>', 4)
-                w(f, f'<MODIFICATIONDATE>{now}</MODIFICATIONDATE>', 4)
-                w(f, f'<GUID>{sv_guid}</GUID>', 4)
-                w(f, '<RULES>', 4)
-
-                # Rules for existing condition (Phase 0)
-                if title == "Bestand":
-                    for pset, prop in bauphase_props:
-                        # Show all elements with Bauphase = 0 in light gray
-                        self._write_rule_indent(
-                            f, prop, pset, "Equals", phase,
-                            "AddSetColored", (204, 204, 204, 255), indent_level=5
-                        )
+        if deterministic:
+            # GUIDs derived from project, phase and rule configuration
+            now = deterministic_timestamp(self.selected_files)
+            rule_key = repr((title, sorted(bauphase_props), sorted(rueckbau_props)))
+            set_key = deterministic_guid(self.project_key(), rule_key)
+        else:
+            now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+
+        # Rules depend on the phase only, zones just append their own rule
+        phase_rules = {}
+        sets = []
+        for zone, set_phases in (zones if zones is not None else [(None, phases)]):
+            if deterministic:
+                set_guid = set_key if zone is None else deterministic_guid(set_key, zone_property, zone)
+            else:
+                set_guid = uuid.uuid4()
+            views = []
+            for i, phase in enumerate(set_phases):
+                if phase not in phase_rules:
+                    phase_rules[phase] = compile_phase_rules(phase, bauphase_props, rueckbau_props)
+                rules = phase_rules[phase]
+                if zone is not None:
+                    # Remove all elements outside the zone or without a zone
+                    z_prop, z_pset, z_type, z_value_type = zone_property
+                    z_value_type = z_value_type or ZOOM_VALUE_TYPES.get(type(zone), "StringValue")
+                    rules = rules + [
+                        PhaseRule((RuleCondition(z_pset, z_prop, "ne", zone, z_type, z_value_type),), "remove", None),
+                        PhaseRule((RuleCondition(z_pset, z_prop, "undefined", None, z_type, z_value_type),),
+                                  "remove", None)
+                    ]
+                views.append({
+                    "phase": phase,
+                    "title": f"Bauzustand Phase {self.phase_title(phase, i, len(set_phases))}",
+                    "guid": deterministic_guid(set_guid, phase) if deterministic else uuid.uuid4(),
+                    "rules": rules
+                })
+            sets.append({
+                "title": f"{title} - {zone}" if zone is not None else title,
+                "zone": zone,
+                "guid": set_guid,
+                "views": views
+            })
+        return {"title": title, "creator": username, "date": now, "sets": sets}
+
+    def read_ifc_bytes(self, filepath):
+        """Read the raw content of an IFC file (ifcZIP is decompressed in memory)"""
+        with open_ifc_stream(filepath) as f:
+            return f.read()
+
+    def collect_element_phases(self, ifc, psets, props_bau, props_rueck):
+        """Collect the (Bauphase, Rueckbauphase) of all elements carrying a phase"""
+        element_phases = ElementPhases()
+        for obj in ifc.by_type("IfcElement"):
+            bau = self.get_phases_from_ifc(obj, psets, props_bau)
+            rueck = self.get_phases_from_ifc(obj, psets, props_rueck)
+            if bau or rueck:
+                element_phases.add(obj.id(), min(bau) if bau else None, min(rueck) if rueck else None)
+        return element_phases
+
+    def _representation_items(self, element):
+        """(item id, id of its existing styled item or None) for all representation items of an element"""
+        shape = getattr(element, "Representation", None)
+        if shape is None:
+            return ()
+        items = []
+        for rep in (getattr(shape, "Representations", []) or []):
+            for item in (getattr(rep, "Items", []) or []):
+                # StyledByItem is SET [0:1]: an existing styled item is retargeted, not duplicated
+                styled = getattr(item, "StyledByItem", None) or ()
+                items.append((item.id(), styled[0].id() if styled else None))
+        return tuple(items)
+
+    def _status_style_records(self, schema, next_id):
+        """Create surface styles for the status colours; returns (records, {status: style id}, next id)"""
+        records = []
+        styles = {}
+        for status, (r, g, b, a) in STATUS_COLORS.items():
+            colour, rendering, style = next_id, next_id + 1, next_id + 2
+            next_id += 3
+            records.append(f"#{colour}=IFCCOLOURRGB('{status}',{r / 255:.4f},{g / 255:.4f},{b / 255:.4f});")
+            records.append(f"#{rendering}=IFCSURFACESTYLERENDERING(#{colour},{1 - a / 255:.4f},$,$,$,$,$,$,.NOTDEFINED.);")
+            records.append(f"#{style}=IFCSURFACESTYLE('Bauzustand {status}',.BOTH.,(#{rendering}));")
+            # IFC2x3 requires a presentation style assignment between styled item and style
+            if schema.upper().startswith("IFC2X3"):
+                records.append(f"#{next_id}=IFCPRESENTATIONSTYLEASSIGNMENT((#{style}));")
+                style = next_id
+                next_id += 1
+            styles[status] = style
+        return [r.encode() for r in records], styles, next_id
+
+    def export_phase_states(self):
+        """Write one IFC file per construction state (phase) for every selected model"""
+        if not self.selected_files:
+            messagebox.showerror("Fehler", "Keine Dateien ausgewählt")
+            return
+        from_schedule = self.phase_source.get() == PHASE_SOURCES[1]
+        selection = None if from_schedule else self.get_property_selection()
+        if selection is None and not from_schedule:
+            return
+        out_dir = filedialog.askdirectory(title="Zielordner für Bauzustände wählen")
+        if not out_dir:
+            return
+        with_colors = self.export_status_colors.get()
+
+        # Schedule phases: task dates are ranked across all models first (the models stay open)
+        opened = {}
+        date_rank = None
+        if from_schedule:
+            for file in self.selected_files:
+                try:
+                    opened[file] = self.open_ifc_file_safely(file)
+                except Exception as e:
+                    self.log(f"Fehler beim Lesen {os.path.basename(file)}: {e}")
+            date_rank = self.schedule_dates(opened.values())
+
+        # Element phases of all models (phase list is shared across models like the smartviews)
+        models = []
+        values = PhaseCollector()
+        for file in (list(opened) if from_schedule else self.selected_files):
+            try:
+                ifc = opened.pop(file) if from_schedule else self.open_ifc_file_safely(file)
+                if from_schedule:
+                    element_phases = self.build_task_phase_index(ifc, date_rank)
                 else:
-                    # Rules for construction phases
-                    
-                    # Rule: Show elements that haven't been built or demolished (gray)
-                    for b_pset, b_prop in bauphase_props:
-                        for r_pset, r_prop in rueckbau_props:
-                            # Elements with Bauphase = 0 AND Rueckbauphase = 0
-                            self._write_rule_indent(f, b_prop, b_pset, "Equals", "0.00000000000",
-                                                    "And...", (204, 204, 204, 255), indent_level=5)
-                            self._write_rule_indent(f, r_prop, r_pset, "Equals", "0.00000000000",
-                                                    "AddSetColored", (204, 204, 204, 255), indent_level=5)
-                            # Elements with Bauphase = 0 AND Rueckbauphase > current phase
-                            self._write_rule_indent(f, b_prop, b_pset, "Equals", "0.00000000000",
-                                                    "And...", (204, 204, 204, 255), indent_level=5)
-                            self._write_rule_indent(f, r_prop, r_pset, "Greater", phase,
-                                                    "AddSetColored", (204, 204, 204, 255), indent_level=5)
-
-                    # Rule: Show elements from previous phases (dark gray)
-                    for pset, prop in bauphase_props:
-                        self._write_rule_indent(f, prop, pset, "Less", phase, "And...", None, indent_level=5)
-                        self._write_rule_indent(f, prop, pset, "Greater", "0.00000000000",
-                                                "AddSetColored", (85, 85, 85, 255), indent_level=5)
-                        # Rule: Show elements being built in current phase (red)
-                        self._write_rule_indent(f, prop, pset, "Equals", phase,
-                                                "AddSetColored", (255, 0, 0, 255), indent_level=5)
-
-                    # Rule: Show elements being demolished in current phase (yellow, transparent)
-                    for pset, prop in rueckbau_props:
-                        self._write_rule_indent(f, prop, pset, "Equals", phase,
-                                                "AddSetColored", (255, 249, 10, 255), indent_level=5)
-                        self._write_rule_indent(f, prop, pset, "Equals", phase,
-                                                "SetTransparent", None, indent_level=5)
-                        # Rule: Remove elements demolished in previous phases
-                        self._write_rule_indent(f, prop, pset, "Less", phase, "And...", None, indent_level=5)
-                        self._write_rule_indent(f, prop, pset, "NotEquals", "0.00000000000",
-                                                "Remove", None, indent_level=5)
-
-                # Close smartview
-                w(f, '</RULES>', 4)
-                w(f,
-                  '<INFORMATIONTAKEOFF><PROPERTYSETNAME>None</PROPERTYSETNAME><PROPERTYNAME>None</PROPERTYNAME><OPERATION>0</OPERATION></INFORMATIONTAKEOFF>',
-                  4)
-                w(f, '<EXPLODEMODE>KeepParentsAndChildren</EXPLODEMODE>', 4)
-                w(f, '</SMARTVIEW>', 3)
-
-            # Close XML structure
-            w(f, '</SMARTVIEWS>', 2)
-            w(f, '</SMARTVIEWSET>', 1)
-            w(f, '</SMARTVIEWSETS>')
-
-    def _write_rule_indent(self, f, prop_name, pset, condition_type, value, action_type, color=None, indent_level=0):
-        """Write a single rule to the XML file"""
-        indent = "    " * indent_level
-        parts = [
-            "<RULE>",
-            "<IFCTYPE>Any</IFCTYPE>",
-            "<PROPERTY>",
-            f"<n>{prop_name}</n>",
-            f"<PROPERTYSETNAME>{pset}</PROPERTYSETNAME>",
-            "<TYPE>PropertySet</TYPE><VALUETYPE>DoubleValue</VALUETYPE><UNIT>None</UNIT>",
-            "</PROPERTY>",
-            "<CONDITION>",
-            f"<TYPE>{condition_type}</TYPE>",
-            f"<VALUE>{value}</VALUE>",
-            "</CONDITION>",
-            "<ACTION>",
-            f"<TYPE>{action_type}</TYPE>",
-        ]
-        # Add color if provided
-        if color:
-            r, g, b, a = color
-            parts.append(f"<R>{r}</R><G>{g}</G><B>{b}</B><A>{a}</A>")
-        parts.extend(["</ACTION>", "</RULE>"])
+                    element_phases = self.collect_element_phases(ifc, *selection)
+                items = {}
+                if with_colors:
+                    items = {eid: self._representation_items(ifc.by_id(eid)) for eid in element_phases}
+                models.append((file, ifc.schema, element_phases, items))
+                values.update(element_phases.phase_values())
+                self.log(f"{os.path.basename(file)}: {len(element_phases)} Elemente mit Phasen")
+            except Exception as e:
+                self.log(f"Fehler beim Lesen {os.path.basename(file)}: {e}")
+        self.log_peak_memory()
+
+        if not values:
+            messagebox.showerror("Fehler", "Keine Phasen gefunden")
+            return
+        phases = finalize_phases(values)
+        self.log(f"Gefundene Phasen: {phases}")
+
+        written = 0
+        for file, schema, element_phases, items in models:
+            try:
+                # Index records and their shared dependency closure once per model
+                graph = StepRecordGraph(self.read_ifc_bytes(file))
+                styled_items = {styled for entries in items.values() for _, styled in entries if styled}
+                graph.assign_owners(element_phases.keys(), replaceable=styled_items)
+                style_records, styles, next_id = [], {}, graph.max_id + 1
+                if with_colors:
+                    style_records, styles, next_id = self._status_style_records(schema, next_id)
+
+                stem = os.path.splitext(os.path.basename(file))[0]
+                for i, phase in enumerate(phases):
+                    title = self.phase_title(phase, i, len(phases))
+                    standing = set()
+                    extra = list(style_records)
+                    replacements = {}
+                    styled = set()
+                    styled_id = next_id
+                    for eid, (bau, rueck) in element_phases.items():
+                        status = element_state(bau, rueck, phase)
+                        if status is None:
+                            continue
+                        standing.add(eid)
+                        if status not in styles:
+                            continue
+                        for item, existing in items.get(eid, ()):
+                            # Items shared between elements keep the first status colour
+                            if item in styled:
+                                continue
+                            styled.add(item)
+                            record_id = existing or styled_id
+                            record = f"#{record_id}=IFCSTYLEDITEM(#{item},(#{styles[status]}),$);".encode()
+                            if existing:
+                                replacements[existing] = record
+                            else:
+                                extra.append(record)
+                                styled_id += 1
+                    path = os.path.join(out_dir, f"{stem}_Bauzustand_{title}.ifc")
+                    graph.write_subset(path, standing, extra, replacements)
+                    written += 1
+                self.log(f"{os.path.basename(file)}: {len(phases)} Bauzustände exportiert")
+            except Exception as e:
+                self.log(f"Fehler beim Export {os.path.basename(file)}: {e}")
 
-        line = indent + "".join(parts) + "\n"
-        f.write(line)
+        self.log(f"Fertig! {written} IFC-Dateien unter folgendem Pfad gespeichert:\n{out_dir}")
+        messagebox.showinfo("Erfolg", f"{written} Bauzustände gespeichert:\n{out_dir}")
 
     def log(self, msg):
         """Add timestamped message to status log"""
@@ -909,7 +2900,13 @@ class BIMcollabGUI(ctk.CTk):
 
 # Application entry point
 if __name__ == "__main__":
-    app = BIMcollabGUI(darkdetect.isDark())$
+    import darkdetect
+    import multiprocessing
+
+    # Worker processes of the parallel scan start from the frozen executable
+    multiprocessing.freeze_support()
+
+    app = BIMcollabGUI(darkdetect.isDark())
 
     # Close the splash screen
     try: